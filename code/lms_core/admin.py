@@ -1,4 +1,5 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.utils import timezone
 from lms_core.models import (
     Course,
     CourseMember,
@@ -6,8 +7,13 @@ from lms_core.models import (
     Comment,
     CourseContentCompletion,
     CourseCompletion,
+    CourseProgress,
     CourseAnnouncement
 )
+from lms_core.search import search
+
+# Batas hasil pencarian full-text di admin (course paling relevan)
+ADMIN_SEARCH_LIMIT = 1000
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
@@ -17,6 +23,17 @@ class CourseAdmin(admin.ModelAdmin):
     readonly_fields = ["created_at", "updated_at"]
     fields = ["name", "description", "price", "image", "teacher", "created_at", "updated_at"]
 
+    def get_search_results(self, request, queryset, search_term):
+        # Index full-text, bukan icontains yang memindai seluruh kolom description
+        if not search_term:
+            return queryset, False
+        hits, has_more = search(search_term, timezone.now(), limit=ADMIN_SEARCH_LIMIT, include_hidden=True,
+                                kinds=["course"], snippets=False)
+        if has_more:
+            messages.warning(request, f"Hanya {ADMIN_SEARCH_LIMIT} course paling relevan yang ditampilkan; "
+                                      f"perjelas kata kunci untuk mempersempit hasil.")
+        return queryset.filter(id__in=[hit["id"] for hit in hits]), False
+
 @admin.register(CourseMember)
 class CourseMemberAdmin(admin.ModelAdmin):
     list_display = ['id', 'course', 'user', 'roles', 'created_at']
@@ -41,6 +58,13 @@ class CourseCompletionAdmin(admin.ModelAdmin):
     list_filter = ["user", "course"]
     search_fields = ["user__username", "course__name"]
 
+@admin.register(CourseProgress)
+class CourseProgressAdmin(admin.ModelAdmin):
+    list_display = ["id", "user", "course", "completed_contents", "total_contents", "updated_at"]
+    list_filter = ["course"]
+    search_fields = ["user__username", "course__name"]
+    readonly_fields = ["completed_contents", "total_contents"]
+
 @admin.register(CourseAnnouncement)
 class CourseAnnouncementAdmin(admin.ModelAdmin):
     list_display = ["id", "course", "title", "show_date", "created_at"]
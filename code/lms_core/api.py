@@ -1,38 +1,55 @@
+import math
+import time
 from datetime import datetime, timedelta
 from typing import List, Optional
 
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
-from django.db.models import Count, Q
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.db.models.functions import Substr
 from django.http import HttpRequest
-from django.shortcuts import get_object_or_404
+from django.shortcuts import aget_object_or_404, get_object_or_404
 from django.utils import timezone
 
-from ninja import NinjaAPI, Path, Router
+from ninja import NinjaAPI, Path, Query, Router
 from ninja.errors import HttpError
+from ninja.pagination import paginate
 
 from lms_core.models import (
     Comment, Course, CourseAnnouncement, CourseCompletion, CourseContent,
-    CourseContentBookmark, CourseContentCompletion, CourseFeedback, CourseMember
+    CourseContentBookmark, CourseContentCompletion, CourseFeedback, CourseMember, course_contents_cache_key,
+    get_course_progress, get_user_activity, moderate_comments, refresh_course_counters, subtree_filter,
+    user_activity_cache_key
 )
 from lms_core.schema import (
-    AnnouncementIn, AnnouncementOut, BatchEnrollIn, BookmarkIn, BookmarkOut, CourseCommentIn,
+    AnnouncementIn, AnnouncementOut, BatchEnrollIn, BatchEnrollOut, BookmarkIn, BookmarkOut, CommentBulkModerationIn,
+    CommentBulkModerationOut, ContentOutlineOut, CourseCommentIn,
     CourseCommentModerationIn, CourseCommentOut, CourseCompletionIn, CourseCompletionOut,
     CourseContentCompletionIn, CourseContentCompletionOut, CourseContentFull, CourseContentIn,
-    CourseEnrollmentLimitIn, CourseMemberOut, CourseSchemaIn, CourseSchemaOut, FeedbackIn,
-    FeedbackOut, LoginIn, UserOut, UserRegisterIn
+    CourseEnrollmentLimitIn, CourseListOut, CourseMemberOut, CourseProgressOut, CourseSchemaIn, CourseSchemaOut,
+    FeedbackIn, FeedbackOut, LoginIn, RefreshIn, SearchIn, SearchPageOut, UserOut, UserRegisterIn
 )
-from lms_core.utils import create_jwt_token, validate_password
+from lms_core.auth import REFRESH, api_auth, create_token_pair, decode_token
+from lms_core.db_router import use_primary
+from lms_core.pagination import CursorPagination
+from lms_core.response_cache import cache_response, response_cache
+from lms_core.search import search
 
-apiv1 = NinjaAPI()
+# Auth default semua route: settings.LMS_API_AUTH; route bisa memilih sendiri lewat auth=api_auth("...")
+apiv1 = NinjaAPI(auth=api_auth())
 
 # =====================
 # AUTHENTICATION
 # =====================
 
+# Route auth tidak memakai auth API: header Authorization yang kedaluwarsa tidak boleh
+# menghalangi login atau refresh (refresh token divalidasi sendiri dari body)
+
 # Register
-@apiv1.post("/auth/register", response=UserOut)
+@apiv1.post("/auth/register", response=UserOut, auth=None)
 def register_user(request, user_in: UserRegisterIn):
     if User.objects.filter(username=user_in.username).exists():
         raise HttpError(400, "Username sudah digunakan")
@@ -43,94 +60,172 @@ def register_user(request, user_in: UserRegisterIn):
     user = User.objects.create(
         username=user_in.username,
         email=user_in.email,
-        first_name=user_in.first_name,
-        last_name=user_in.last_name,
+        first_name=user_in.first_name or '',
+        last_name=user_in.last_name or '',
         password=hashed_password
     )
     return user
 
 # Login
-@apiv1.post("/auth/login")
+@apiv1.post("/auth/login", auth=None)
 def login_user(request, data: LoginIn):
     user = authenticate(request, username=data.username, password=data.password)
     if user:
-        login(request, user)
-        token = create_jwt_token(user)
-        return {"message": "Login successful", "token": token}
+        if settings.LMS_API_AUTH != "token":
+            # Mode token saja tidak menulis session sama sekali
+            login(request, user)
+        return {"message": "Login successful", **create_token_pair(user)}
     else:
         raise HttpError(401, "Invalid credentials")
 
+# Refresh token: peran dibaca ulang dari database supaya perubahan is_staff/is_active ikut terbawa
+@apiv1.post("/auth/refresh", auth=None)
+def refresh_token(request, data: RefreshIn):
+    payload = decode_token(data.refresh, REFRESH)
+    user = User.objects.filter(id=payload["sub"], is_active=True).first()
+    if user is None:
+        raise HttpError(401, "Token tidak valid")
+    return create_token_pair(user)
+
 # =====================
 # COURSE
 # =====================
 
+def comments_for_output():
+    # Semua relasi yang di-nest CourseCommentOut diambil dalam satu JOIN
+    return Comment.objects.select_related('content__course', 'member__course', 'member__user') \
+        .defer('content__course__description', 'member__course__description')
+
 # Komentar
 @apiv1.put("/comments/{comment_id}/moderate", response=CourseCommentOut)
 def moderate_comment(request, comment_id: int, moderation_in: CourseCommentModerationIn):
     if not request.user.is_authenticated or not request.user.is_staff:
         raise HttpError(403, "Tidak diizinkan")
-    comment = get_object_or_404(Comment, id=comment_id)
-    comment.is_moderated = moderation_in.is_moderated
-    comment.save()
-    return comment
+    # Lewat jalur bulk: counter course dan cache thread diurus moderate_comments
+    moderate_comments([comment_id], moderation_in.is_moderated)
+    return get_object_or_404(comments_for_output(), id=comment_id)
 
-@apiv1.get("/courses/{course_id}/contents/{content_id}/comments", response=List[CourseCommentOut])
-def get_content_comments(request, course_id: int, content_id: int):
-    content = get_object_or_404(CourseContent, id=content_id, course_id=course_id)
-    comments = Comment.objects.filter(content=content, is_moderated=True).order_by('-created_at')
-    return comments
+@apiv1.post("/comments/moderate", response=CommentBulkModerationOut)
+def moderate_comments_bulk(request, data: CommentBulkModerationIn):
+    if not request.user.is_authenticated:
+        raise HttpError(403, "Tidak diizinkan")
+    requested = list(dict.fromkeys(data.comment_ids))
+    # Staff boleh semua komentar; pengajar hanya komentar di course miliknya
+    moderated = moderate_comments(requested, data.is_moderated,
+                                  teacher_id=None if request.user.is_staff else request.user.id)
+    changed = set(moderated)
+    return {
+        "message": f"{len(moderated)} komentar dimoderasi.",
+        "moderated": moderated,
+        "skipped": [pk for pk in requested if pk not in changed],
+    }
+
+@apiv1.get("/courses/{course_id}/moderation-queue", response=List[CourseCommentOut])
+@paginate(CursorPagination, ordering=('created_at', 'id'))
+def get_moderation_queue(request, course_id: int):
+    course = get_object_or_404(Course.objects.only('id', 'teacher_id'), id=course_id)
+    if not request.user.is_authenticated or not (request.user.id == course.teacher_id or request.user.is_staff):
+        raise HttpError(403, "Tidak diizinkan")
+    # Tertua dulu lewat comment_course_queue_idx (course, is_moderated, created_at, id);
+    # lihat get_content_comments soal __in
+    return comments_for_output().filter(course_id=course_id, is_moderated__in=[False])
+
+@apiv1.get("/courses/{course_id}/contents/{content_id}/comments", response=List[CourseCommentOut],
+           auth=api_auth(asynchronous=True))
+@cache_response("content:{content_id}:comments")
+@paginate(CursorPagination, ordering=('-created_at', '-id'))
+async def get_content_comments(request, course_id: int, content_id: int):
+    # Tiap halaman: range scan comment_thread_idx (content, is_moderated, created_at, id) sebanyak limit.
+    # is_moderated__in: SQLite menulis filter boolean biasa tanpa "= 1" sehingga kolom index kedua tidak terpakai.
+    content = await aget_object_or_404(CourseContent.objects.only('id'), id=content_id, course_id=course_id)
+    return comments_for_output().filter(content=content, is_moderated__in=[True])
 
 # Enroll siswa
-@apiv1.post("/courses/{course_id}/batch-enroll")
+@apiv1.post("/courses/{course_id}/batch-enroll", response=BatchEnrollOut)
 def batch_enroll_students(request, course_id: int, enroll_data: BatchEnrollIn):
-    course = get_object_or_404(Course, id=course_id)
-    if not request.user.is_authenticated or not (request.user == course.teacher):
+    if not request.user.is_authenticated:
         raise HttpError(403, "Hanya pengajar kursus")
-
-    if course.max_students is not None:
-        current_members_count = CourseMember.objects.filter(course=course).count()
-        if current_members_count >= course.max_students:
-            raise HttpError(400, "Kuota siswa penuh")
-
-    enrolled_count = 0
-    for user_id in enroll_data.user_ids:
-        user = get_object_or_404(User, id=user_id)
-        if not CourseMember.objects.filter(course=course, user=user).exists():
-            CourseMember.objects.create(course=course, user=user, roles='std')
-            enrolled_count += 1
-
-    return {"message": f"{enrolled_count} siswa berhasil didaftarkan."}
+    requested = list(dict.fromkeys(enroll_data.user_ids))
+
+    with transaction.atomic():
+        # Di Postgres baris course dikunci sampai commit sehingga batch lain untuk course
+        # ini menunggu dan hitungan kuota di bawah tetap benar. SQLite mengabaikan
+        # select_for_update; di sana batch diserialkan oleh transaksi IMMEDIATE dan
+        # antrian tulis dari LMS_SQLITE_PROFILE (lihat lms_core/sqlite.py).
+        course = get_object_or_404(
+            Course.objects.select_for_update().only('id', 'teacher_id', 'max_students'), id=course_id
+        )
+        if request.user.id != course.teacher_id:
+            raise HttpError(403, "Hanya pengajar kursus")
+
+        found = set(User.objects.filter(id__in=requested).values_list('id', flat=True))
+        members = set(CourseMember.objects.filter(course_id=course.id, user_id__in=found)
+                      .values_list('user_id', flat=True))
+        skipped = [uid for uid in requested if uid in members]
+        rejected = [uid for uid in requested if uid not in found]
+        enrolled = [uid for uid in requested if uid in found and uid not in members]
+
+        quota_full = False
+        if course.max_students is not None:
+            free = max(course.max_students - CourseMember.objects.filter(course_id=course.id).count(), 0)
+            # Yang tidak kebagian kuota ikut dilaporkan di rejected, tidak digagalkan seluruhnya
+            quota_full = len(enrolled) > free
+            enrolled, rejected = enrolled[:free], rejected + enrolled[free:]
+
+        CourseMember.objects.bulk_create(
+            [CourseMember(course_id=course.id, user_id=uid, roles='std') for uid in enrolled],
+            ignore_conflicts=True,
+        )
+        if enrolled:
+            # bulk_create tidak mengirim signal: counter dan cache aktivitas diurus di sini
+            refresh_course_counters(Course.objects.filter(id=course.id))
+            response_cache().delete_many([user_activity_cache_key(uid) for uid in enrolled])
+
+    message = f"{len(enrolled)} siswa berhasil didaftarkan."
+    if quota_full:
+        message += " Kuota siswa penuh."
+    return {
+        "message": message,
+        "enrolled": enrolled,
+        "skipped": skipped,
+        "rejected": rejected,
+    }
 
 # Aktivitas pengguna
 @apiv1.get("/users/{user_id}/dashboard")
 def get_user_activity_dashboard(request, user_id: int):
     if not request.user.is_authenticated or (request.user.id != user_id and not request.user.is_staff):
         raise HttpError(403, "Tidak diizinkan")
-    user = get_object_or_404(User, id=user_id)
+    activity = get_user_activity(user_id)
+    if activity is None:
+        raise HttpError(404, "User tidak ditemukan")
     return {
-        "user_id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "courses_as_student": CourseMember.objects.filter(user=user, roles='std').count(),
-        "courses_created_as_teacher": Course.objects.filter(teacher=user).count(),
-        "comments_written": Comment.objects.filter(member__user=user).count(),
-        "content_completed": CourseContentCompletion.objects.filter(user=user).count(),
+        "user_id": activity["id"],
+        "username": activity["username"],
+        "email": activity["email"],
+        "courses_as_student": activity["courses_as_student"],
+        "courses_created_as_teacher": activity["courses_created_as_teacher"],
+        "comments_written": activity["comments_written"],
+        "content_completed": activity["content_completed"],
     }
 
 # Analytics
 @apiv1.get("/courses/{course_id}/analytics")
 def get_course_analytics(request, course_id: int):
-    course = get_object_or_404(Course, id=course_id)
-    if not request.user.is_authenticated or not (request.user == course.teacher or request.user.is_staff):
+    # Satu baris Course: semua angka diambil dari counter denormalisasi
+    course = get_object_or_404(Course.objects.only(
+        'id', 'name', 'teacher_id', 'member_count', 'content_count', 'comment_count', 'feedback_count', 'rating_sum'
+    ), id=course_id)
+    if not request.user.is_authenticated or not (request.user.id == course.teacher_id or request.user.is_staff):
         raise HttpError(403, "Tidak diizinkan")
-    feedback_count = CourseFeedback.objects.filter(course=course).count()
     return {
         "course_id": course.id,
         "course_name": course.name,
-        "total_members": CourseMember.objects.filter(course=course).count(),
-        "total_contents": CourseContent.objects.filter(course=course).count(),
-        "total_comments": Comment.objects.filter(content__course=course, is_moderated=True).count(),
-        "total_feedbacks": feedback_count,
+        "total_members": course.member_count,
+        "total_contents": course.content_count,
+        "total_comments": course.comment_count,
+        "total_feedbacks": course.feedback_count,
+        "average_rating": round(course.rating_sum / course.feedback_count, 2) if course.feedback_count else None,
     }
 
 # =====================
@@ -143,17 +238,26 @@ def mark_content_complete(request, content_id: int):
     if not request.user.is_authenticated:
         raise HttpError(401, "Harus login")
     content = get_object_or_404(CourseContent, id=content_id)
-    if not CourseMember.objects.filter(course=content.course, user=request.user).exists():
+    if not CourseMember.objects.filter(course_id=content.course_id, user=request.user).exists():
         raise HttpError(403, "Bukan anggota kursus")
     completion, created = CourseContentCompletion.objects.get_or_create(user=request.user, content=content)
     if not created:
         raise HttpError(409, "Sudah ditandai")
-    total = CourseContent.objects.filter(course=content.course).count()
-    done = CourseContentCompletion.objects.filter(user=request.user, content__course=content.course).count()
-    if total > 0 and done >= total:
-        CourseCompletion.objects.get_or_create(user=request.user, course=content.course)
+    # CourseProgress sudah diperbarui signal completion; cukup baca satu baris
+    progress = get_course_progress(request.user.id, content.course_id)
+    if progress.is_completed:
+        CourseCompletion.objects.get_or_create(user=request.user, course_id=content.course_id)
     return completion
 
+@apiv1.get("/courses/{course_id}/progress", response=CourseProgressOut)
+def get_my_course_progress(request, course_id: int):
+    if not request.user.is_authenticated:
+        raise HttpError(401, "Harus login")
+    progress = get_course_progress(request.user.id, course_id)
+    if progress is None:
+        raise HttpError(404, "Course tidak ditemukan")
+    return progress
+
 @apiv1.get("/courses/{course_id}/certificate_data", response=Optional[CourseCompletionOut])
 def get_course_certificate_data(request, course_id: int):
     if not request.user.is_authenticated:
@@ -177,13 +281,19 @@ def list_user_completed_courses(request, user_id: int):
 # COURSE
 # =====================
 
-@apiv1.get("/courses", response=List[CourseSchemaOut])
-def get_courses(request):
-    return Course.objects.all()
+@apiv1.get("/courses", response=List[CourseListOut], auth=api_auth(asynchronous=True))
+@cache_response("courses")
+@paginate(CursorPagination, ordering=('-created_at', '-id'))
+async def get_courses(request, excerpt: bool = False):
+    courses = Course.objects.select_related('teacher').defer('description')
+    if excerpt:
+        courses = courses.annotate(excerpt=Substr('description', 1, settings.LMS_COURSE_EXCERPT_LENGTH))
+    return courses
 
-@apiv1.get("/courses/{course_id}", response=CourseSchemaOut)
-def get_course_detail(request, course_id: int):
-    return get_object_or_404(Course, id=course_id)
+@apiv1.get("/courses/{course_id}", response=CourseSchemaOut, auth=api_auth(asynchronous=True))
+@cache_response("course:{course_id}")
+async def get_course_detail(request, course_id: int):
+    return await aget_object_or_404(Course.objects.select_related('teacher'), id=course_id)
 
 @apiv1.post("/courses", response=CourseSchemaOut)
 def create_course(request, course_in: CourseSchemaIn):
@@ -201,18 +311,108 @@ def create_course(request, course_in: CourseSchemaIn):
 # COURSE CONTENT
 # =====================
 
-@apiv1.get("/courses/{course_id}/contents", response=List[CourseContentFull])
-def get_course_contents(request, course_id: int):
-    course = get_object_or_404(Course, id=course_id)
-    contents = CourseContent.objects.filter(course=course).order_by('created_at')
-    now = timezone.now()
-    visible = []
-    for c in contents:
-        if request.user.is_authenticated and request.user.is_staff:
-            visible.append(c)
-        elif (c.release_date is None or c.release_date <= now) and (c.end_date is None or c.end_date >= now):
-            visible.append(c)
-    return visible
+def visible_at(now):
+    # Jendela jadwal konten; didukung index content_schedule_idx (course, release_date, end_date)
+    return (Q(release_date__isnull=True) | Q(release_date__lte=now)) & \
+        (Q(end_date__isnull=True) | Q(end_date__gte=now))
+
+async def seconds_until_next_schedule_change(course_id, now):
+    # Cache konten harus kedaluwarsa tepat saat ada konten yang rilis atau berakhir
+    boundary = await CourseContent.objects.filter(course_id=course_id).aaggregate(
+        next_release=Min('release_date', filter=Q(release_date__gt=now)),
+        next_end=Min('end_date', filter=Q(end_date__gte=now)),
+    )
+    timeout = settings.LMS_CONTENTS_CACHE_TIMEOUT
+    for moment in boundary.values():
+        if moment is not None:
+            timeout = min(timeout, math.ceil((moment - now).total_seconds()))
+    return max(timeout, 1)
+
+def contents_for_output(course_id):
+    return CourseContent.objects.filter(course_id=course_id).select_related('course') \
+        .defer('course__description').order_by('created_at', 'id')
+
+async def cached_visible_contents(course_id):
+    """
+    List konten yang terlihat beserta waktu (epoch) list itu harus dibangun ulang.
+    Disimpan di cache bersama agar signal perubahan konten dari worker mana pun
+    ikut menghapusnya.
+    """
+    key = course_contents_cache_key(course_id)
+    cached = await response_cache().aget(key)
+    if cached is None:
+        # Cache berumur panjang: diisi dari primary supaya tidak menyimpan data replica yang tertinggal
+        with use_primary():
+            if not await Course.objects.filter(id=course_id).aexists():
+                raise HttpError(404, "Course tidak ditemukan")
+            now = timezone.now()
+            contents = [
+                CourseContentFull.from_orm(c).model_dump()
+                async for c in contents_for_output(course_id).filter(visible_at(now))
+            ]
+            timeout = await seconds_until_next_schedule_change(course_id, now)
+        cached = (contents, time.time() + timeout)
+        await response_cache().aset(key, cached, timeout)
+    return cached
+
+def contents_validator(request, course_id, **kwargs):
+    # Sumber ETag: konten yang dilihat role ini; rilis/berakhirnya jadwal mengubah jumlah baris
+    contents = CourseContent.objects.filter(course_id=course_id)
+    if request.user.is_authenticated and request.user.is_staff:
+        return contents
+    return contents.filter(visible_at(timezone.now()))
+
+@apiv1.get("/courses/{course_id}/contents", response=List[CourseContentFull], auth=api_auth(asynchronous=True))
+@cache_response("course:{course_id}", "course:{course_id}:contents", validator=contents_validator)
+@paginate(CursorPagination, ordering=('created_at', 'id'))
+async def get_course_contents(request, course_id: int):
+    if request.user.is_authenticated and request.user.is_staff:
+        await aget_object_or_404(Course.objects.only('id'), id=course_id)
+        return contents_for_output(course_id)
+    contents, expires_at = await cached_visible_contents(course_id)
+    # Response cache tidak boleh hidup melewati jadwal rilis/berakhir berikutnya
+    request.response_cache_timeout = max(1, math.ceil(expires_at - time.time()))
+    return contents
+
+def outline_rows(request, course_id):
+    # Terurut path = preorder pohon; course + path dilayani content_path_idx tanpa sort
+    contents = CourseContent.objects.filter(course_id=course_id)
+    if not (request.user.is_authenticated and request.user.is_staff):
+        contents = contents.filter(visible_at(timezone.now()))
+    return contents.order_by('path').values('id', 'parent_id', 'name', 'release_date', 'end_date')
+
+def build_outline(rows, root_id=None):
+    """
+    Susun baris terurut preorder menjadi pohon dalam satu lintasan. Node yang
+    induknya tidak ikut terbaca (konten tersembunyi) dilewati beserta turunannya.
+    """
+    nodes, roots = {}, []
+    for row in rows:
+        node = {**row, 'children': []}
+        if row['id'] == root_id or (root_id is None and row['parent_id'] is None):
+            roots.append(node)
+        elif row['parent_id'] in nodes:
+            nodes[row['parent_id']]['children'].append(node)
+        else:
+            continue
+        nodes[row['id']] = node
+    return roots
+
+@apiv1.get("/courses/{course_id}/outline", response=List[ContentOutlineOut], auth=api_auth(asynchronous=True))
+async def get_course_outline(request, course_id: int):
+    rows = [row async for row in outline_rows(request, course_id)]
+    if not rows:
+        await aget_object_or_404(Course.objects.only('id'), id=course_id)
+    return build_outline(rows)
+
+@apiv1.get("/courses/{course_id}/outline/{content_id}", response=ContentOutlineOut,
+           auth=api_auth(asynchronous=True))
+async def get_content_outline(request, course_id: int, content_id: int):
+    root = await aget_object_or_404(CourseContent.objects.only('id', 'path'), id=content_id, course_id=course_id)
+    rows = [row async for row in outline_rows(request, course_id).filter(subtree_filter(root.path))]
+    if not rows or rows[0]['id'] != root.id:
+        raise HttpError(404, "Konten tidak ditemukan")
+    return build_outline(rows, root_id=root.id)[0]
 
 @apiv1.post("/courses/{course_id}/contents", response=CourseContentFull)
 def create_course_content(request, course_id: int, content_in: CourseContentIn):
@@ -261,7 +461,7 @@ def create_announcement_api(request, course_id: int, data: AnnouncementIn):
     )
     return AnnouncementOut(
         id=ann.id,
-        course_id=ann.course.id,
+        course_id=ann.course_id,
         title=ann.title,
         message=ann.message,
         show_date=ann.show_date,
@@ -269,19 +469,21 @@ def create_announcement_api(request, course_id: int, data: AnnouncementIn):
         updated_at=ann.updated_at
     )
 
-@apiv1.get("/courses/{course_id}/announcements/", response=List[AnnouncementOut])
-def list_announcements_api(request, course_id: int):
-    course = get_object_or_404(Course, id=course_id)
+@apiv1.get("/courses/{course_id}/announcements/", response=List[AnnouncementOut], auth=api_auth(asynchronous=True))
+@cache_response("course:{course_id}:announcements",
+                validator=lambda request, course_id, **kwargs: CourseAnnouncement.objects.filter(course_id=course_id))
+async def list_announcements_api(request, course_id: int):
+    course = await aget_object_or_404(Course.objects.only('id'), id=course_id)
     anns = CourseAnnouncement.objects.filter(course=course).order_by('show_date')
     return [AnnouncementOut(
         id=a.id,
-        course_id=a.course.id,
+        course_id=a.course_id,
         title=a.title,
         message=a.message,
         show_date=a.show_date,
         created_at=a.created_at,
         updated_at=a.updated_at
-    ) for a in anns]
+    ) async for a in anns]
 
 @apiv1.put("/announcements/{announcement_id}/", response=AnnouncementOut)
 def edit_announcement_api(request, announcement_id: int, data: AnnouncementIn):
@@ -294,7 +496,7 @@ def edit_announcement_api(request, announcement_id: int, data: AnnouncementIn):
     ann.save()
     return AnnouncementOut(
         id=ann.id,
-        course_id=ann.course.id,
+        course_id=ann.course_id,
         title=ann.title,
         message=ann.message,
         show_date=ann.show_date,
@@ -327,18 +529,19 @@ def add_bookmark(request, data: BookmarkIn):
         created_at=bookmark.created_at
     )
 
-@apiv1.get("/bookmarks/", response=List[BookmarkOut])
-def list_bookmarks(request):
+@apiv1.get("/bookmarks/", response=List[BookmarkOut], auth=api_auth(asynchronous=True))
+async def list_bookmarks(request):
     if not request.user.is_authenticated:
         raise HttpError(401, "Harus login")
-    bookmarks = CourseContentBookmark.objects.filter(user=request.user).select_related('content__course')
+    bookmarks = CourseContentBookmark.objects.filter(user=request.user) \
+        .select_related('content__course').defer('content__course__description')
     return [
         BookmarkOut(
             id=b.id,
             content=b.content,
             course=b.content.course,
             created_at=b.created_at
-        ) for b in bookmarks
+        ) async for b in bookmarks
     ]
 
 @apiv1.delete("/bookmarks/{bookmark_id}/")
@@ -373,9 +576,12 @@ def add_feedback(request, data: FeedbackIn):
     )
 
 @apiv1.get("/courses/{course_id}/feedbacks/", response=List[FeedbackOut])
+@cache_response("course:{course_id}", "course:{course_id}:feedbacks",
+                validator=lambda request, course_id, **kwargs: CourseFeedback.objects.filter(course_id=course_id))
 def list_feedbacks(request, course_id: int):
     course = get_object_or_404(Course, id=course_id)
-    feedbacks = CourseFeedback.objects.filter(course=course).select_related('user', 'course')
+    feedbacks = CourseFeedback.objects.filter(course=course).select_related('user', 'course') \
+        .defer('course__description')
     return [
         FeedbackOut(
             id=f.id,
@@ -408,4 +614,15 @@ def edit_feedback(request, feedback_id: int, data: FeedbackIn):
 def delete_feedback(request, feedback_id: int):
     feedback = get_object_or_404(CourseFeedback, id=feedback_id, user=request.user)
     feedback.delete()
-    return {"message": "Feedback deleted."}
\ No newline at end of file
+    return {"message": "Feedback deleted."}
+
+# =====================
+# SEARCH
+# =====================
+
+@apiv1.get("/search", response=SearchPageOut)
+def search_api(request, params: Query[SearchIn]):
+    # Index full-text (FTS5 di SQLite, tsvector/GIN di Postgres), lihat lms_core/search.py
+    staff = request.user.is_authenticated and request.user.is_staff
+    items, has_more = search(params.q, timezone.now(), params.limit, params.offset, include_hidden=staff)
+    return {"items": items, "next_offset": params.offset + params.limit if has_more else None}
@@ -0,0 +1,152 @@
+from datetime import timedelta
+from functools import lru_cache
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.utils import timezone
+from ninja.errors import HttpError
+from ninja.security import HttpBearer
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+# =====================
+# KEYS
+# =====================
+
+@lru_cache(maxsize=None)
+def signing_key():
+    # Key di-parse sekali per proses; PyJWT menerima objek key langsung
+    with open(settings.LMS_JWT_PRIVATE_KEY_PATH, "rb") as f:
+        return serialization.load_pem_private_key(f.read(), password=None)
+
+
+@lru_cache(maxsize=None)
+def verifying_key():
+    with open(settings.LMS_JWT_PUBLIC_KEY_PATH, "rb") as f:
+        return serialization.load_pem_public_key(f.read())
+
+
+# =====================
+# TOKEN
+# =====================
+
+def _encode(user, token_type, lifetime):
+    now = timezone.now()
+    payload = {
+        "sub": str(user.pk),
+        "type": token_type,
+        "iat": now,
+        "exp": now + timedelta(seconds=lifetime),
+    }
+    if token_type == ACCESS:
+        # Klaim peran & profil: request ber-token tidak perlu membaca auth_user
+        payload.update({
+            "username": user.username,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "is_staff": user.is_staff,
+            "is_superuser": user.is_superuser,
+        })
+    return jwt.encode(payload, signing_key(), algorithm="RS256")
+
+
+def create_access_token(user):
+    return _encode(user, ACCESS, settings.LMS_JWT_ACCESS_TOKEN_LIFETIME)
+
+
+def create_refresh_token(user):
+    return _encode(user, REFRESH, settings.LMS_JWT_REFRESH_TOKEN_LIFETIME)
+
+
+def create_token_pair(user):
+    return {
+        "token": create_access_token(user),
+        "refresh": create_refresh_token(user),
+        "token_type": "bearer",
+        "expires_in": settings.LMS_JWT_ACCESS_TOKEN_LIFETIME,
+    }
+
+
+def decode_token(token, token_type):
+    try:
+        payload = jwt.decode(token, verifying_key(), algorithms=["RS256"], leeway=settings.LMS_JWT_LEEWAY,
+                             options={"require": ["sub", "type", "exp"]})
+    except jwt.ExpiredSignatureError:
+        raise HttpError(401, "Token kedaluwarsa")
+    except jwt.InvalidTokenError:
+        raise HttpError(401, "Token tidak valid")
+    if payload["type"] != token_type:
+        raise HttpError(401, "Token tidak valid")
+    return payload
+
+
+def user_from_claims(payload):
+    """User dari klaim token, tanpa query. Tidak untuk disimpan (save) ke database."""
+    user = User(
+        id=int(payload["sub"]),
+        username=payload.get("username", ""),
+        email=payload.get("email", ""),
+        first_name=payload.get("first_name", ""),
+        last_name=payload.get("last_name", ""),
+        is_staff=payload.get("is_staff", False),
+        is_superuser=payload.get("is_superuser", False),
+    )
+    user._state.adding = False
+    return user
+
+
+# =====================
+# NINJA AUTH
+# =====================
+
+class JWTAuth(HttpBearer):
+    """
+    Bearer token RS256. Token valid mengisi request.user dari klaim; token
+    salah/kedaluwarsa langsung 401. Tanpa header, auth berikutnya dicoba.
+    """
+
+    def authenticate(self, request, token):
+        request.user = user_from_claims(decode_token(token, ACCESS))
+        return request.user
+
+
+def session_user(request):
+    # Session Django (bisa anonim); endpoint sendiri yang memutuskan 401/403
+    return request.user
+
+
+async def asession_user(request):
+    # Versi async: user di-resolve sekali (request.auser) supaya view async tidak
+    # menyentuh SimpleLazyObject yang akan query secara sinkron
+    request.user = await request.auser()
+    return request.user
+
+
+def anonymous_user(request):
+    # Mode token saja: session tidak pernah dibaca, request tanpa token dianggap anonim
+    request.user = AnonymousUser()
+    return request.user
+
+
+def api_auth(mode=None, asynchronous=False):
+    """
+    Daftar auth Ninja untuk satu route (atau default NinjaAPI):
+    "session" = session Django, "token" = hanya bearer token (tanpa session sama sekali),
+    "both" = token bila ada, selain itu session. Default: settings.LMS_API_AUTH.
+    Route `async def` memakai asynchronous=True; JWTAuth tidak menyentuh database
+    sehingga aman dipanggil langsung di event loop.
+    """
+    mode = mode or settings.LMS_API_AUTH
+    session = asession_user if asynchronous else session_user
+    if mode == "session":
+        return [session]
+    if mode == "token":
+        return [JWTAuth(), anonymous_user]
+    if mode == "both":
+        return [JWTAuth(), session]
+    raise ValueError(f"Mode auth tidak dikenal: {mode}")
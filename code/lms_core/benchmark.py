@@ -0,0 +1,516 @@
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from lms_core.api import apiv1
+from lms_core.auth import create_access_token, create_refresh_token
+from lms_core.models import (
+    Comment, Course, CourseAnnouncement, CourseCompletion, CourseContent,
+    CourseContentBookmark, CourseContentCompletion, CourseFeedback, CourseMember, refresh_content_paths,
+    refresh_course_counters, refresh_course_progress
+)
+
+API_PREFIX = "/api/v1"
+BENCH_PASSWORD = "bench-password"
+
+
+# =====================
+# DATASET
+# =====================
+
+def seed(scale=1):
+    """
+    Dataset benchmark. Semua relasi yang di-list oleh route (member, komentar,
+    konten, bookmark, feedback, pengumuman) tumbuh linear terhadap `scale`,
+    jadi N+1 langsung terlihat sebagai jumlah query yang ikut naik.
+    """
+    password = make_password(BENCH_PASSWORD)
+    teacher = User.objects.create(username="bench_teacher", email="teacher@bench.local", password=password)
+    staff = User.objects.create(username="bench_staff", email="staff@bench.local", password=password,
+                                is_staff=True, is_superuser=True)
+    student = User.objects.create(username="bench_student", email="student@bench.local", password=password)
+    User.objects.bulk_create([
+        User(username=f"bench_user_{i}", email=f"user{i}@bench.local", password=password)
+        for i in range(20 * scale)
+    ])
+    users = list(User.objects.filter(username__startswith="bench_user_"))
+
+    Course.objects.bulk_create([
+        Course(name=f"Course {i}", description="Lorem ipsum " * 300, price=100 * i, teacher=teacher)
+        for i in range(10 * scale)
+    ])
+    courses = list(Course.objects.filter(teacher=teacher).order_by("id"))
+    course = courses[0]
+
+    CourseMember.objects.bulk_create(
+        [CourseMember(course=course, user=student)] +
+        [CourseMember(course=course, user=u) for u in users]
+    )
+    members = list(CourseMember.objects.filter(course=course))
+
+    CourseContent.objects.bulk_create([
+        CourseContent(name=f"Content {i}", description="Materi " * 100, course=course,
+                      video_url=f"https://video.local/{i}")
+        for i in range(10 * scale)
+    ])
+    contents = list(CourseContent.objects.filter(course=course).order_by("id"))
+    content = contents[0]
+    # Pohon 3-cabang: outline dan subtree punya kedalaman yang tumbuh bersama scale
+    for i, c in enumerate(contents[1:], start=1):
+        c.parent = contents[(i - 1) // 3]
+    CourseContent.objects.bulk_update(contents[1:], ["parent"])
+
+    Comment.objects.bulk_create([
+        Comment(content=content, course=course, member=members[i % len(members)], comment=f"Komentar {i}",
+                is_moderated=True)
+        for i in range(20 * scale)
+    ] + [
+        # Antrian moderasi
+        Comment(content=contents[i % len(contents)], course=course, member=members[i % len(members)],
+                comment=f"Baru {i}")
+        for i in range(10 * scale)
+    ])
+    CourseContentCompletion.objects.bulk_create([
+        CourseContentCompletion(user=student, content=c) for c in contents[1:]
+    ])
+    CourseContentBookmark.objects.bulk_create([
+        CourseContentBookmark(user=student, content=c) for c in contents
+    ])
+    CourseFeedback.objects.bulk_create([
+        CourseFeedback(user=u, course=course, rating=1 + i % 5, comment="Bagus")
+        for i, u in enumerate(users)
+    ])
+    today = timezone.now().date()
+    CourseAnnouncement.objects.bulk_create([
+        CourseAnnouncement(course=course, title=f"Info {i}", message="Pengumuman", show_date=today)
+        for i in range(5 * scale)
+    ])
+    CourseCompletion.objects.bulk_create([
+        CourseCompletion(user=u, course=course) for u in users
+    ])
+    refresh_course_counters()
+    refresh_course_progress()
+    refresh_content_paths()
+
+    return {
+        "teacher": teacher, "staff": staff, "student": student,
+        "course": course, "content": content,
+        "comment": Comment.objects.filter(content=content).first(),
+        "announcement": CourseAnnouncement.objects.filter(course=course).first(),
+        "feedback": CourseFeedback.objects.filter(course=course).first(),
+    }
+
+
+# =====================
+# ROUTES
+# =====================
+
+def _new_content(ctx, i):
+    return {"content_id": CourseContent.objects.create(name=f"Baru {i}", course=ctx["course"]).id}
+
+
+def _new_announcement(ctx, i):
+    ann = CourseAnnouncement.objects.create(course=ctx["course"], title="Hapus", message="-",
+                                            show_date=timezone.now().date())
+    return {"announcement_id": ann.id}
+
+
+def _new_bookmark(ctx, i):
+    return {"bookmark_id": CourseContentBookmark.objects.create(
+        user=ctx["student"], content=CourseContent.objects.create(name=f"Bm {i}", course=ctx["course"])).id}
+
+
+def _new_feedback(ctx, i):
+    course = Course.objects.create(name=f"Fb {i}", description="-", price=0, teacher=ctx["teacher"])
+    return {"feedback_id": CourseFeedback.objects.create(user=ctx["student"], course=course).id}
+
+
+def _new_users(ctx, i):
+    users = User.objects.bulk_create([User(username=f"enroll_{i}_{n}") for n in range(5)])
+    return {"user_ids": [u.id for u in users]}
+
+
+def _unique_username(ctx, i):
+    return {"username": f"register_{i}"}
+
+
+def _own_feedback(ctx, i):
+    return {"feedback_id": CourseFeedback.objects.get_or_create(user=ctx["student"], course=ctx["course"])[0].id}
+
+
+def _new_comments(ctx, i):
+    member = CourseMember.objects.filter(course=ctx["course"]).first()
+    comments = Comment.objects.bulk_create([
+        Comment(content=ctx["content"], course=ctx["course"], member=member, comment=f"Antre {i}.{n}")
+        for n in range(20)
+    ])
+    return {"comment_ids": [c.id for c in comments]}
+
+
+def _refresh_token(ctx, i):
+    return {"refresh": create_refresh_token(ctx["student"])}
+
+
+def _tomorrow(ctx, i):
+    return {"show_date": (timezone.now() + timedelta(days=1)).isoformat()}
+
+
+class Route:
+    """
+    Satu skenario benchmark untuk satu operasi apiv1.
+    `budget` adalah batas jumlah query SQL per request (termasuk session/auth).
+    """
+
+    def __init__(self, method, path, budget, user=None, body=None, prepare=None, status=200, params=None):
+        self.method = method
+        self.path = path
+        self.budget = budget
+        self.user = user
+        self.body = body or {}
+        self.prepare = prepare
+        self.status = status
+        self.params = params or {}
+
+    @property
+    def name(self):
+        return f"{self.method} {self.path}"
+
+
+ROUTES = [
+    Route("POST", "/auth/register", 3, body={"email": "{username}@bench.local", "username": "{username}",
+                                             "password": "rahasia123"}, prepare=_unique_username),
+    Route("POST", "/auth/login", 9, body={"username": "bench_student", "password": BENCH_PASSWORD}),
+    Route("POST", "/auth/refresh", 1, body={"refresh": "{refresh}"}, prepare=_refresh_token),
+    Route("PUT", "/comments/{comment_id}/moderate", 6, user="staff", body={"is_moderated": True}),
+    Route("POST", "/comments/moderate", 7, user="staff", body={"comment_ids": "{comment_ids}", "is_moderated": True},
+          prepare=_new_comments),
+    Route("GET", "/courses/{course_id}/moderation-queue", 4, user="teacher"),
+    Route("GET", "/courses/{course_id}/contents/{content_id}/comments", 4),
+    Route("POST", "/courses/{course_id}/batch-enroll", 9, user="teacher", body={"user_ids": "{user_ids}"},
+          prepare=_new_users),
+    Route("GET", "/users/{user_id}/dashboard", 3, user="student"),
+    Route("GET", "/courses/{course_id}/analytics", 3, user="teacher"),
+    Route("POST", "/contents/{content_id}/complete", 11, user="student", prepare=_new_content),
+    Route("GET", "/courses/{course_id}/certificate_data", 4, user="student", status=404),
+    Route("GET", "/users/{user_id}/completed_courses_list", 4, user="student"),
+    Route("GET", "/courses/{course_id}/progress", 1, user="student_token"),
+    Route("GET", "/courses", 3),
+    Route("POST", "/courses", 3, user="teacher", body={"name": "Baru", "description": "-", "price": 0}),
+    Route("GET", "/courses/{course_id}", 3),
+    Route("GET", "/courses/{course_id}/contents", 6),
+    Route("GET", "/courses/{course_id}/outline", 3),
+    Route("GET", "/courses/{course_id}/outline/{content_id}", 4),
+    Route("POST", "/courses/{course_id}/contents", 8, user="teacher", body={"name": "Materi baru"}),
+    Route("GET", "/courses/{course_id}/completions/", 5, user="teacher"),
+    Route("POST", "/courses/{course_id}/announcements/", 5, user="teacher",
+          body={"title": "Info", "message": "-", "show_date": "{show_date}"}, prepare=_tomorrow),
+    Route("GET", "/courses/{course_id}/announcements/", 5),
+    Route("PUT", "/announcements/{announcement_id}/", 6, user="teacher",
+          body={"title": "Ubah", "message": "-", "show_date": "{show_date}"}, prepare=_tomorrow),
+    Route("DELETE", "/announcements/{announcement_id}/", 8, user="teacher", prepare=_new_announcement),
+    Route("POST", "/bookmarks/", 5, user="student", body={"content_id": "{content_id}"}),
+    Route("GET", "/bookmarks/", 3, user="student"),
+    Route("DELETE", "/bookmarks/{bookmark_id}/", 4, user="student", prepare=_new_bookmark),
+    Route("POST", "/feedbacks/", 9, user="student", body={"course_id": "{course_id}", "rating": 5, "comment": "ok"}),
+    Route("GET", "/courses/{course_id}/feedbacks/", 5),
+    Route("PUT", "/feedbacks/{feedback_id}/", 7, user="student",
+          body={"course_id": "{course_id}", "rating": 4, "comment": "ubah"}, prepare=_own_feedback),
+    Route("DELETE", "/feedbacks/{feedback_id}/", 7, user="student", prepare=_new_feedback),
+    Route("GET", "/search", 4, params={"q": "materi"}),
+]
+
+
+def api_operations():
+    return {
+        f"{method} {path}"
+        for path, view in apiv1.default_router.path_operations.items()
+        for op in view.operations
+        for method in op.methods
+    }
+
+
+def uncovered_routes(routes=ROUTES):
+    return sorted(api_operations() - {r.name for r in routes})
+
+
+# =====================
+# RUNNER
+# =====================
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _fill(value, params):
+    if isinstance(value, str):
+        if value.startswith("{") and value.endswith("}") and value[1:-1] in params:
+            return params[value[1:-1]]
+        return value.format(**params)
+    return value
+
+
+def _base_params(ctx):
+    return {
+        "course_id": ctx["course"].id, "content_id": ctx["content"].id,
+        "comment_id": ctx["comment"].id, "announcement_id": ctx["announcement"].id,
+        "feedback_id": ctx["feedback"].id, "user_id": ctx["student"].id,
+    }
+
+
+def run_route(route, ctx, clients, iterations=20):
+    client = clients[route.user]
+    timings, queries, sizes = [], [], []
+    for i in range(iterations):
+        params = _base_params(ctx)
+        if route.prepare:
+            params.update(route.prepare(ctx, i))
+        url = API_PREFIX + route.path.format(**params)
+        body = {k: _fill(v, params) for k, v in route.body.items()}
+        call = getattr(client, route.method.lower())
+        kwargs = {"content_type": "application/json", "data": json.dumps(body)} if route.method != "GET" \
+            else {"data": route.params}
+
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = call(url, **kwargs)
+            elapsed = time.perf_counter() - start
+
+        if response.status_code != route.status:
+            raise AssertionError(f"{route.name}: status {response.status_code}, diharapkan {route.status}: "
+                                 f"{response.content[:200]!r}")
+        timings.append(elapsed * 1000)
+        queries.append(len(captured))
+        sizes.append(len(response.content))
+
+    return {
+        "route": route.name,
+        "queries": max(queries),
+        "budget": route.budget,
+        "over_budget": max(queries) > route.budget,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "bytes": max(sizes),
+    }
+
+
+def make_clients(ctx):
+    clients = {None: Client()}
+    for role in ("teacher", "student", "staff"):
+        clients[role] = Client()
+        clients[role].force_login(ctx[role])
+    # Bearer token tanpa session: auth tidak menyentuh tabel session/auth_user
+    clients["student_token"] = Client(headers={"Authorization": f"Bearer {create_access_token(ctx['student'])}"})
+    return clients
+
+
+def run_benchmark(scale=1, iterations=20, routes=ROUTES):
+    ctx = seed(scale)
+    clients = make_clients(ctx)
+    results = [run_route(route, ctx, clients, iterations) for route in routes]
+    return {"scale": scale, "iterations": iterations, "routes": results}
+
+
+def compare_with_baseline(report, baseline, tolerance=0.25):
+    """
+    Bandingkan report dengan baseline tersimpan. Regresi bila jumlah query naik
+    atau p95 lebih lambat dari `tolerance` (relatif).
+    """
+    previous = {r["route"]: r for r in baseline.get("routes", [])}
+    regressions = []
+    for row in report["routes"]:
+        old = previous.get(row["route"])
+        if old is None:
+            continue
+        if row["queries"] > old["queries"]:
+            regressions.append(f"{row['route']}: query {old['queries']} -> {row['queries']}")
+        if old["p95_ms"] and row["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{row['route']}: p95 {old['p95_ms']}ms -> {row['p95_ms']}ms")
+    return regressions
+
+
+# =====================
+# KONKURENSI SQLITE
+# =====================
+
+CONCURRENT_READS = [
+    ("student", "GET", "/courses/{course_id}/progress", None),
+    ("student", "GET", "/bookmarks/", None),
+    ("student", "GET", "/users/{user_id}/dashboard", None),
+    ("teacher", "GET", "/courses/{course_id}/analytics", None),
+]
+CONCURRENT_WRITES = [
+    ("teacher", "PUT", "/announcements/{announcement_id}/",
+     {"title": "Ubah", "message": "-", "show_date": "{show_date}"}),
+    ("teacher", "POST", "/courses/{course_id}/contents", {"name": "Materi baru"}),
+    ("feedback_owner", "PUT", "/feedbacks/{feedback_id}/", {"course_id": "{course_id}", "rating": 4, "comment": "ubah"}),
+]
+
+
+def throughput_summary(timings, seconds):
+    if not timings:
+        return {"count": 0, "rps": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None}
+    return {
+        "count": len(timings),
+        "rps": round(len(timings) / seconds, 1),
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "p99_ms": round(percentile(timings, 99), 2),
+    }
+
+
+def run_concurrent_mix(ctx, threads=8, seconds=10, write_ratio=0.2, seed_value=0):
+    """
+    Campuran baca/tulis dari `threads` thread selama `seconds` detik lewat stack
+    WSGI penuh (middleware ikut jalan). Auth memakai bearer token supaya request
+    baca benar-benar tidak menulis session.
+    """
+    params = {**_base_params(ctx), "show_date": (timezone.now() + timedelta(days=1)).date().isoformat()}
+    tokens = {
+        "student": create_access_token(ctx["student"]),
+        "teacher": create_access_token(ctx["teacher"]),
+        "feedback_owner": create_access_token(ctx["feedback"].user),
+    }
+    deadline = time.perf_counter() + seconds
+    lock = threading.Lock()
+    stats = {"read": [], "write": [], "errors": 0, "locked": 0}
+
+    def worker(n):
+        rng = random.Random(seed_value + n)
+        clients = {role: Client(raise_request_exception=False, headers={"Authorization": f"Bearer {token}"})
+                   for role, token in tokens.items()}
+        timings = {"read": [], "write": []}
+        errors = locked = 0
+        try:
+            while time.perf_counter() < deadline:
+                kind = "write" if rng.random() < write_ratio else "read"
+                role, method, path, body = rng.choice(CONCURRENT_WRITES if kind == "write" else CONCURRENT_READS)
+                kwargs = {} if body is None else {
+                    "content_type": "application/json",
+                    "data": json.dumps({k: _fill(v, params) for k, v in body.items()}),
+                }
+                start = time.perf_counter()
+                try:
+                    response = getattr(clients[role], method.lower())(API_PREFIX + path.format(**params), **kwargs)
+                    ok = response.status_code == 200
+                except Exception as e:  # koneksi rusak di tengah jalan tetap dihitung sebagai error
+                    ok, response = False, None
+                    locked += "locked" in str(e)
+                elapsed = (time.perf_counter() - start) * 1000
+                if ok:
+                    timings[kind].append(elapsed)
+                else:
+                    errors += 1
+                    if response is not None and b"locked" in response.content:
+                        locked += 1
+        finally:
+            connections.close_all()
+        with lock:
+            stats["read"] += timings["read"]
+            stats["write"] += timings["write"]
+            stats["errors"] += errors
+            stats["locked"] += locked
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    return {
+        "read": throughput_summary(stats["read"], seconds),
+        "write": throughput_summary(stats["write"], seconds),
+        "errors": stats["errors"],
+        "locked_errors": stats["locked"],
+    }
+
+
+# =====================
+# ASGI VS WSGI
+# =====================
+
+HOT_READS = [
+    "/courses",
+    "/courses/{course_id}",
+    "/courses/{course_id}/contents",
+    "/courses/{course_id}/contents/{content_id}/comments",
+    "/courses/{course_id}/announcements/",
+    "/bookmarks/",
+]
+
+
+def _hot_read_urls(ctx):
+    params = _base_params(ctx)
+    return [API_PREFIX + path.format(**params) for path in HOT_READS]
+
+
+def run_wsgi_load(ctx, concurrency=32, seconds=10, seed_value=0):
+    """Route baca panas lewat WSGIHandler: satu thread per request yang berjalan bersamaan."""
+    urls = _hot_read_urls(ctx)
+    headers = {"Authorization": f"Bearer {create_access_token(ctx['student'])}"}
+    deadline = time.perf_counter() + seconds
+    lock = threading.Lock()
+    timings, errors = [], []
+
+    def worker(n):
+        rng = random.Random(seed_value + n)
+        client = Client(raise_request_exception=False, headers=headers)
+        mine, failed = [], 0
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = client.get(rng.choice(urls))
+                if response.status_code == 200:
+                    mine.append((time.perf_counter() - start) * 1000)
+                else:
+                    failed += 1
+        finally:
+            connections.close_all()
+        with lock:
+            timings.extend(mine)
+            errors.append(failed)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return {**throughput_summary(timings, seconds), "errors": sum(errors)}
+
+
+async def run_asgi_load(ctx, concurrency=32, seconds=10, seed_value=0):
+    """Route baca panas lewat ASGIHandler: `concurrency` task dalam satu event loop."""
+    urls = _hot_read_urls(ctx)
+    # AsyncClient hanya meneruskan header yang diberikan per request
+    headers = {"Authorization": f"Bearer {create_access_token(ctx['student'])}"}
+    deadline = time.perf_counter() + seconds
+    timings, errors = [], []
+
+    async def worker(n):
+        rng = random.Random(seed_value + n)
+        client = AsyncClient(raise_request_exception=False)
+        failed = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get(rng.choice(urls), headers=headers)
+            if response.status_code == 200:
+                timings.append((time.perf_counter() - start) * 1000)
+            else:
+                failed += 1
+        errors.append(failed)
+
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return {**throughput_summary(timings, seconds), "errors": sum(errors)}
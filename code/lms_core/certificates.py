@@ -0,0 +1,97 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.template.loader import render_to_string
+
+# URL sertifikat tetap, sedangkan snapshot bisa dirender ulang (--force) atau dihapus
+# bersama completion-nya: browser boleh memakai salinannya sebentar, lalu wajib
+# revalidasi lewat ETag (304 murah, cukup stat file)
+SNAPSHOT_CACHE_CONTROL = "private, max-age=300, must-revalidate"
+
+
+# =====================
+# SNAPSHOT
+# =====================
+
+def snapshot_path(completion_id):
+    return Path(settings.LMS_CERTIFICATE_DIR) / f"{completion_id}.html"
+
+
+def snapshot_etag(path):
+    # Dari stat file, tanpa membaca isi; render ulang (--force) selalu mengganti mtime
+    stat = path.stat()
+    return f'"{path.stem}-{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def existing_snapshots():
+    """ID completion yang snapshot-nya sudah ada di LMS_CERTIFICATE_DIR."""
+    try:
+        names = os.listdir(settings.LMS_CERTIFICATE_DIR)
+    except FileNotFoundError:
+        return set()
+    return {int(name[:-5]) for name in names if name.endswith(".html") and name[:-5].isdigit()}
+
+
+def _write_atomic(path, html):
+    # Tulis ke file sementara lalu rename: pembaca tidak pernah melihat file setengah jadi
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(html)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def render_snapshots(completion_ids, force=False):
+    """
+    Render certificate.html untuk completion di `completion_ids` dan simpan ke
+    disk. Completion tidak berubah setelah dibuat, jadi isi snapshot (nama user,
+    course, progres saat selesai) sengaja dibekukan. Dua query per batch:
+    completion beserta user/course, lalu baris progres. Mengembalikan jumlah
+    snapshot yang ditulis.
+    """
+    CourseCompletion = apps.get_model("lms_core", "CourseCompletion")
+    CourseProgress = apps.get_model("lms_core", "CourseProgress")
+    completions = [
+        c for c in CourseCompletion.objects.filter(id__in=completion_ids).select_related("user", "course")
+        if force or not snapshot_path(c.id).exists()
+    ]
+    if not completions:
+        return 0
+    progress = {
+        (p.user_id, p.course_id): p
+        for p in CourseProgress.objects.filter(user_id__in={c.user_id for c in completions},
+                                               course_id__in={c.course_id for c in completions})
+    }
+    for completion in completions:
+        row = progress.get((completion.user_id, completion.course_id))
+        total = row.total_contents if row else completion.course.content_count
+        html = render_to_string("certificate.html", {
+            "user": completion.user,
+            "course": completion.course,
+            "completion_date": completion.completion_date,
+            "certificate_id": completion.id,
+            "is_course_completed": True,
+            "total_contents": total,
+            "completed_contents": row.completed_contents if row else total,
+        })
+        _write_atomic(snapshot_path(completion.id), html)
+    return len(completions)
+
+
+def ensure_snapshot(completion_id):
+    """Path snapshot; dirender saat itu juga bila belum ada (mis. data hasil bulk_create)."""
+    path = snapshot_path(completion_id)
+    if not path.exists():
+        render_snapshots([completion_id])
+    return path
+
+
+def delete_snapshot(completion_id):
+    snapshot_path(completion_id).unlink(missing_ok=True)
@@ -0,0 +1,119 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Status per request: {"pinned": baca ke primary, "wrote": sudah ada tulis}. Dict yang sama
+# diubah di tempat supaya tetap terlihat dari context yang disalin sync_to_async/async_to_sync.
+_state = ContextVar("lms_db_state", default=None)
+
+
+# =====================
+# ROUTER
+# =====================
+
+class PrimaryReplicaRouter:
+    """
+    Tulis selalu ke primary (`default`), baca ke salah satu LMS_DB_REPLICAS.
+    Baca tetap ke primary bila request sudah di-pin (read-your-writes) atau
+    sedang di dalam transaksi primary (mis. select_for_update).
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.LMS_DB_REPLICAS
+        state = _state.get()
+        if not replicas or (state and state["pinned"]) or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is None:
+            # Di luar request (command, shell): cukup pin context ini
+            _state.set({"pinned": True, "wrote": True})
+        else:
+            state["pinned"] = state["wrote"] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica berisi data yang sama dengan primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def use_primary():
+    """Baca di dalam blok ini ke primary, mis. saat mengisi cache yang berumur panjang."""
+    token = _state.set({"pinned": True, "wrote": False})
+    try:
+        yield
+    finally:
+        state = _state.get()
+        _state.reset(token)
+        if state["wrote"]:
+            PrimaryReplicaRouter().db_for_write(None)
+
+
+# =====================
+# MIDDLEWARE
+# =====================
+
+def _pin_cookie_valid(request):
+    try:
+        return float(request.COOKIES.get(settings.LMS_DB_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReplicaPinMiddleware:
+    """
+    Read-your-writes: request non-GET membaca dari primary, dan setelah ada
+    tulis, request berikutnya dari klien yang sama (cookie) tetap ke primary
+    selama LMS_DB_REPLICA_LAG detik, yaitu batas lag replica yang ditoleransi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.LMS_DB_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _begin(self, request):
+        state = {"pinned": request.method not in SAFE_METHODS or _pin_cookie_valid(request), "wrote": False}
+        return state, _state.set(state)
+
+    def _finish(self, state, response):
+        if state["wrote"]:
+            lag = settings.LMS_DB_REPLICA_LAG
+            response.set_cookie(settings.LMS_DB_PIN_COOKIE, f"{time.time() + lag:.3f}", max_age=lag,
+                                httponly=True, samesite="Lax")
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = self._begin(request)
+        try:
+            return self._finish(state, self.get_response(request))
+        finally:
+            _state.reset(token)
+
+    async def __acall__(self, request):
+        state, token = self._begin(request)
+        try:
+            return self._finish(state, await self.get_response(request))
+        finally:
+            _state.reset(token)
@@ -0,0 +1,249 @@
+import random
+import time
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from lms_core.models import (
+    Comment, Course, CourseAnnouncement, CourseCompletion, CourseContent, CourseContentBookmark,
+    CourseContentCompletion, CourseFeedback, CourseMember, refresh_content_paths, refresh_course_counters,
+    refresh_course_progress
+)
+from lms_core.response_cache import invalidate_tags
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_PASSWORD = "lms-password"
+
+FIRST_NAMES = ["Andi", "Budi", "Citra", "Dewi", "Eko", "Fitri", "Gilang", "Hana", "Indra", "Joko",
+               "Kartika", "Lestari", "Made", "Nur", "Putri", "Rizky", "Sari", "Tono", "Utami", "Wahyu"]
+LAST_NAMES = ["Saputra", "Wijaya", "Pratama", "Hidayat", "Nugroho", "Santoso", "Kurniawan", "Lestari",
+              "Permana", "Siregar", "Hasibuan", "Setiawan"]
+TOPICS = ["Python", "Django", "Basis Data", "Jaringan", "Statistika", "Desain UI", "Machine Learning",
+          "Akuntansi", "Bahasa Inggris", "Kalkulus", "Keamanan Siber", "Cloud"]
+RATING_WEIGHTS = [5, 5, 15, 35, 40]
+
+
+# =====================
+# DISTRIBUSI
+# =====================
+
+def zipf_weights(n, s=1.1):
+    """Bobot Zipf kumulatif: sedikit item sangat populer, sisanya ekor panjang."""
+    return list(accumulate(1 / (rank + 1) ** s for rank in range(n)))
+
+
+class Writer:
+    """Penampung bulk_create: baris ditulis per batch supaya memori tetap kecil."""
+
+    def __init__(self, model, batch_size):
+        self.model = model
+        self.batch_size = batch_size
+        self.pending = []
+        self.written = 0
+
+    def add(self, obj):
+        self.pending.append(obj)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            with transaction.atomic():
+                self.model.objects.bulk_create(self.pending, batch_size=self.batch_size)
+            self.written += len(self.pending)
+            self.pending = []
+
+
+# =====================
+# GENERATOR
+# =====================
+
+class LmsDataGenerator:
+    """
+    Dataset sintetis deterministik untuk uji skala: `seed` dan `scale` yang sama
+    menghasilkan struktur dan isi yang sama (kecuali timestamp auto_now).
+
+    Ukuran kira-kira per scale: 1.000 user, 40 course, ~2.000 member, ~1.400 konten
+    bertingkat (modul > materi > sub-materi) dan ~32.000 baris total. Popularitas
+    course dan keaktifan user mengikuti distribusi Zipf/Pareto.
+    """
+
+    def __init__(self, scale=1, seed=42, batch_size=DEFAULT_BATCH_SIZE, password=DEFAULT_PASSWORD, log=print):
+        self.scale = scale
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.password = password
+        self.log = log
+        self.prefix = f"gen{seed}_"
+        self.now = timezone.now()
+
+    def _insert(self, model, objs):
+        """bulk_create satu kali untuk objek yang PK-nya dibutuhkan tahap berikutnya."""
+        with transaction.atomic():
+            return model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def _timed(self, name, func):
+        started = time.perf_counter()
+        count = func()
+        seconds = time.perf_counter() - started
+        rate = count / seconds if seconds else 0
+        self.log(f"{name:<14} {count:>10} baris {seconds:8.2f}s ({rate:,.0f} baris/s)")
+        return count
+
+    # Users
+    def generate_users(self):
+        rng = self.rng
+        n_users = 1000 * self.scale
+        # Satu hash untuk semua user: hashing per user akan mendominasi waktu generate
+        password = make_password(self.password)
+        users = self._insert(User, [
+            User(username=f"{self.prefix}{i:07d}", email=f"{self.prefix}{i:07d}@lms.local", password=password,
+                 first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                 is_staff=i < max(1, n_users // 500))
+            for i in range(n_users)
+        ])
+        self.user_ids = [u.id for u in users]
+        n_teachers = max(1, n_users // 50)
+        self.teacher_ids = self.user_ids[:n_teachers]
+        self.student_ids = self.user_ids[n_teachers:]
+        return len(users)
+
+    # Courses
+    def generate_courses(self):
+        rng = self.rng
+        n_courses = 40 * self.scale
+        teacher_weights = zipf_weights(len(self.teacher_ids))
+        courses = self._insert(Course, [
+            Course(name=f"{rng.choice(TOPICS)} {i + 1}",
+                   description=f"Materi {rng.choice(TOPICS)} " * rng.randint(5, 60),
+                   price=rng.choice([0, 0, 50000, 100000, 250000]),
+                   teacher_id=rng.choices(self.teacher_ids, cum_weights=teacher_weights)[0])
+            for i in range(n_courses)
+        ])
+        self.course_ids = [c.id for c in courses]
+        return len(courses)
+
+    # Members
+    def generate_members(self):
+        rng = self.rng
+        popularity = zipf_weights(len(self.course_ids))
+        pairs = []
+        for user_id in self.student_ids:
+            # Pareto: kebanyakan user ikut 1-3 course, sebagian kecil ikut banyak
+            wanted = min(len(self.course_ids), int(rng.paretovariate(1.5)))
+            chosen = set()
+            for _ in range(wanted * 3):
+                chosen.add(rng.choices(self.course_ids, cum_weights=popularity)[0])
+                if len(chosen) >= wanted:
+                    break
+            pairs.extend((course_id, user_id) for course_id in sorted(chosen))
+        members = self._insert(CourseMember, [CourseMember(course_id=c, user_id=u, roles='std') for c, u in pairs])
+        self.members = {course_id: [] for course_id in self.course_ids}
+        for m in members:
+            self.members[m.course_id].append((m.id, m.user_id))
+        return len(members)
+
+    # Contents
+    def generate_contents(self):
+        """Pohon konten per course, disisipkan per level supaya parent_id sudah punya PK."""
+        rng = self.rng
+        self.contents = {course_id: [] for course_id in self.course_ids}
+        level = []
+        for course_id in self.course_ids:
+            for m in range(rng.randint(2, 8)):
+                level.append((course_id, None, f"Modul {m + 1}", rng.randint(1, 6)))
+        total = 0
+        for depth in range(3):
+            objs = []
+            for course_id, parent_id, name, _ in level:
+                release = end = None
+                roll = rng.random()
+                if roll < 0.08:
+                    release = self.now + timedelta(days=rng.randint(1, 60))
+                elif roll < 0.12:
+                    end = self.now - timedelta(days=rng.randint(1, 60))
+                objs.append(CourseContent(course_id=course_id, parent_id=parent_id, name=name,
+                                          description=f"Isi {name}. " * rng.randint(3, 30),
+                                          video_url=f"https://video.lms.local/{rng.getrandbits(40):x}",
+                                          release_date=release, end_date=end))
+            created = self._insert(CourseContent, objs)
+            total += len(created)
+            next_level = []
+            for (course_id, _, name, children), content in zip(level, created):
+                self.contents[course_id].append(content.id)
+                if depth == 0 or (depth == 1 and rng.random() < 0.3):
+                    for c in range(children if depth == 0 else rng.randint(1, 3)):
+                        next_level.append((course_id, content.id, f"{name}.{c + 1}", 0))
+            level = next_level
+        return total
+
+    # Aktivitas member
+    def generate_activity(self):
+        rng = self.rng
+        writers = {model: Writer(model, self.batch_size) for model in (
+            Comment, CourseContentCompletion, CourseCompletion, CourseContentBookmark, CourseFeedback)}
+        for course_id in self.course_ids:
+            members, contents = self.members[course_id], self.contents[course_id]
+            if not members or not contents:
+                continue
+            # Komentar menumpuk di konten awal dan di member paling aktif
+            content_weights = zipf_weights(len(contents), 0.8)
+            member_weights = zipf_weights(len(members), 1.0)
+            for _ in range(int(len(members) * rng.uniform(0.2, 1.5))):
+                writers[Comment].add(Comment(
+                    content_id=rng.choices(contents, cum_weights=content_weights)[0], course_id=course_id,
+                    member_id=rng.choices(members, cum_weights=member_weights)[0][0],
+                    comment=f"Komentar {rng.getrandbits(32):x}", is_moderated=rng.random() < 0.85))
+            for _, user_id in members:
+                # Beta(0.7, 1.5): banyak yang berhenti di awal, sedikit yang tamat
+                done = round(rng.betavariate(0.7, 1.5) * len(contents))
+                for content_id in contents[:done]:
+                    writers[CourseContentCompletion].add(
+                        CourseContentCompletion(user_id=user_id, content_id=content_id))
+                if done == len(contents):
+                    writers[CourseCompletion].add(CourseCompletion(user_id=user_id, course_id=course_id))
+                if rng.random() < 0.3:
+                    for content_id in rng.sample(contents, min(len(contents), rng.randint(1, 3))):
+                        writers[CourseContentBookmark].add(
+                            CourseContentBookmark(user_id=user_id, content_id=content_id))
+                if rng.random() < 0.3:
+                    writers[CourseFeedback].add(CourseFeedback(
+                        user_id=user_id, course_id=course_id, comment="Feedback",
+                        rating=rng.choices(range(1, 6), weights=RATING_WEIGHTS)[0]))
+        for writer in writers.values():
+            writer.flush()
+            self.log(f"  {writer.model.__name__:<24} {writer.written:>10}")
+        return sum(w.written for w in writers.values())
+
+    # Pengumuman
+    def generate_announcements(self):
+        rng = self.rng
+        today = self.now.date()
+        return len(self._insert(CourseAnnouncement, [
+            CourseAnnouncement(course_id=course_id, title=f"Pengumuman {n + 1}", message="Info untuk peserta.",
+                               show_date=today + timedelta(days=rng.randint(-30, 30)))
+            for course_id in self.course_ids
+            for n in range(rng.randint(0, 5))
+        ]))
+
+    def run(self):
+        if User.objects.filter(username__startswith=self.prefix).exists():
+            raise ValueError(f"Data dengan seed {self.seed} sudah ada (username {self.prefix}*); pakai --seed lain.")
+        started = time.perf_counter()
+        total = 0
+        for name, step in [('users', self.generate_users), ('courses', self.generate_courses),
+                           ('members', self.generate_members), ('contents', self.generate_contents),
+                           ('activity', self.generate_activity), ('announcements', self.generate_announcements)]:
+            total += self._timed(name, step)
+        # bulk_create tidak mengirim signal: counter, progres, path pohon dan cache dihitung ulang sekali di akhir
+        refresh_course_counters(Course.objects.filter(id__in=self.course_ids))
+        refresh_content_paths(self.course_ids)
+        refresh_course_progress(self.course_ids)
+        invalidate_tags("courses")
+        self.log(f"--- {total} baris, {time.perf_counter() - started:.2f} detik ---")
+        return total
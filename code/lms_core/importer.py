@@ -0,0 +1,381 @@
+import csv
+import json
+import math
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from lms_core.models import (
+    Comment, Course, CourseContent, CourseMember, refresh_content_paths, refresh_course_counters,
+    refresh_course_progress
+)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 5000
+# Batas atas password per tugas hashing; batch yang lebih kecil dibagi rata ke worker
+HASH_BATCH_SIZE = 200
+READ_BUFFER_SIZE = 64 * 1024
+
+
+# =====================
+# SUMBER DATA
+# =====================
+
+def read_csv(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+
+def read_json(path, buffer_size=READ_BUFFER_SIZE):
+    """
+    Parser inkremental untuk file berisi satu JSON array: elemen dibaca satu per satu
+    dari buffer berukuran tetap, jadi memori tidak ikut membesar sesuai ukuran file.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf, pos, eof = '', 0, False
+
+        def fill():
+            nonlocal buf, pos, eof
+            data = f.read(buffer_size)
+            eof = not data
+            buf = buf[pos:] + data
+            pos = 0
+
+        def next_char():
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos].isspace():
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return buf[pos] if pos < len(buf) else ''
+                fill()
+
+        if next_char() != '[':
+            raise ValueError(f"{path}: bukan JSON array")
+        pos += 1
+        if next_char() == ']':
+            return
+        while True:
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                # Angka di ujung buffer bisa saja terpotong: pastikan ada pemisah setelahnya
+                if end >= len(buf) and not eof:
+                    raise json.JSONDecodeError("buffer habis", buf, end)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            pos = end
+            yield item
+            sep = next_char()
+            pos += 1
+            if sep == ']':
+                return
+            if sep != ',':
+                raise ValueError(f"{path}: JSON array tidak valid di dekat karakter {sep!r}")
+            next_char()
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# =====================
+# CHECKPOINT
+# =====================
+
+class Checkpoint:
+    """
+    Menyimpan offset baris terakhir yang sudah di-commit per stage, beserta ukuran
+    file sumbernya. Jika file sumber berubah, offset stage itu diabaikan.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+
+    def offset(self, stage, source):
+        saved = self.state.get(stage)
+        if not saved or saved.get('size') != os.path.getsize(source):
+            return 0
+        return saved['offset']
+
+    def save(self, stage, source, offset):
+        if not self.path:
+            return
+        self.state[stage] = {'offset': offset, 'size': os.path.getsize(source)}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        self.state = {}
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# =====================
+# PASSWORD HASHING
+# =====================
+
+def _init_hash_worker():
+    # Worker hasil spawn (macOS/Windows) belum menjalankan django.setup()
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def _hash_batch(passwords):
+    return [make_password(p) for p in passwords]
+
+
+def hash_passwords(passwords, pool=None, workers=1):
+    """
+    Hash password per batch di process pool (PBKDF2 terikat CPU, tidak bisa paralel
+    di thread). Ukuran batch dibagi rata ke `workers` supaya chunk kecil tetap
+    memakai semua worker. Tanpa pool, hashing berjalan serial di proses ini.
+    """
+    if pool is None:
+        return _hash_batch(passwords)
+    size = min(HASH_BATCH_SIZE, max(1, math.ceil(len(passwords) / workers)))
+    return [p for batch in pool.map(_hash_batch, batched(passwords, size)) for p in batch]
+
+
+def is_password_hash(value):
+    try:
+        identify_hasher(value)
+        return True
+    except ValueError:
+        return False
+
+
+# =====================
+# STAGE
+# =====================
+
+class StageResult:
+    def __init__(self, name, unit='baris'):
+        self.name = name
+        self.unit = unit
+        self.resumed = 0
+        self.read = 0
+        self.inserted = 0
+        self.skipped = 0
+        # Bagian dari `skipped` yang ditolak karena data tidak konsisten, per alasan
+        self.rejected = Counter()
+        self.seconds = 0.0
+
+    def __str__(self):
+        rate = self.inserted / self.seconds if self.seconds else 0
+        resumed = f" lanjut-dari={self.resumed}" if self.resumed else ""
+        rejected = "".join(f" {reason}={count}" for reason, count in sorted(self.rejected.items()))
+        return (f"{self.name:<10} dibaca={self.read:<8} masuk={self.inserted:<8} dilewati={self.skipped:<8} "
+                f"{self.seconds:8.2f}s ({rate:,.0f} {self.unit}/s){resumed}{rejected}")
+
+
+class LmsImporter:
+    """
+    Import data LMS secara set-based dan streaming. File sumber dibaca per chunk
+    berukuran tetap; untuk tiap chunk, ID yang sudah ada dan foreign key di-resolve
+    dengan satu query `IN` per tabel, lalu baris baru dimasukkan dengan bulk_create
+    dalam satu transaksi. Setelah commit, offset chunk dicatat di file checkpoint
+    sehingga import yang terputus bisa dilanjutkan.
+
+    ID pada file sumber adalah nomor baris (mulai 1), sama seperti importer2.py.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, chunk_size=DEFAULT_CHUNK_SIZE, workers=None,
+                 prehashed=False, checkpoint=None, log=print):
+        self.path = path
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.prehashed = prehashed
+        self.checkpoint = Checkpoint(checkpoint)
+        self.log = log
+        self.pool = None
+        # StageResult yang sedang berjalan; builder mencatat baris yang ditolak di sini
+        self.stage = None
+        # nomor baris user di user-data.csv -> id auth_user
+        self.user_ids = {}
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _run_stage(self, name, filename, reader, build, model, unit='baris'):
+        result = self.stage = StageResult(name, unit)
+        path = self._file(filename)
+        if not os.path.exists(path):
+            self.log(f"{filename} tidak ditemukan, stage {name} dilewati.")
+            return result
+        started = time.perf_counter()
+        offset = result.resumed = self.checkpoint.offset(name, path)
+        for chunk in batched(islice(reader(path), offset, None), self.chunk_size):
+            with transaction.atomic():
+                objs = list(build(chunk, offset))
+                model.objects.bulk_create(objs, batch_size=self.batch_size, ignore_conflicts=True)
+            offset += len(chunk)
+            self.checkpoint.save(name, path, offset)
+            result.read += len(chunk)
+            result.inserted += len(objs)
+        result.skipped = result.read - result.inserted
+        result.seconds = time.perf_counter() - started
+        self.log(str(result))
+        return result
+
+    # Users
+    def build_users(self, rows, offset):
+        existing = set(User.objects.filter(
+            username__in=[r['username'] for r in rows]).values_list('username', flat=True))
+        new_rows = []
+        for row in rows:
+            if row['username'] not in existing:
+                existing.add(row['username'])
+                new_rows.append(row)
+
+        def needs_hash(row):
+            return not (self.prehashed and is_password_hash(row['password']))
+
+        hashed = iter(hash_passwords([r['password'] for r in new_rows if needs_hash(r)], self.pool, self.workers))
+        for row in new_rows:
+            yield User(username=row['username'],
+                       password=next(hashed) if needs_hash(row) else row['password'],
+                       email=row['email'],
+                       first_name=row['firstname'],
+                       last_name=row['lastname'])
+
+    def map_users(self):
+        path = self._file('user-data.csv')
+        if os.path.exists(path):
+            # Satu pass streaming; yang disimpan hanya map id -> id
+            self.user_ids = {}
+            for start, chunk in enumerate(batched(read_csv(path), self.chunk_size)):
+                usernames = [row['username'] for row in chunk]
+                by_name = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+                for num, username in enumerate(usernames, start=start * self.chunk_size + 1):
+                    if username in by_name:
+                        self.user_ids[num] = by_name[username]
+        else:
+            # Tanpa user-data.csv, id sumber dianggap sama dengan id database
+            self.user_ids = {i: i for i in User.objects.values_list('id', flat=True)}
+
+    def user_id(self, source_id):
+        return self.user_ids.get(source_id)
+
+    # Courses
+    def build_courses(self, rows, offset):
+        ids = range(offset + 1, offset + len(rows) + 1)
+        existing = set(Course.objects.filter(id__in=ids).values_list('id', flat=True))
+        for num, row in zip(ids, rows):
+            teacher_id = self.user_id(int(row['teacher']))
+            if num in existing or teacher_id is None:
+                continue
+            yield Course(id=num, name=row['name'], price=int(row['price']),
+                         description=row['description'], teacher_id=teacher_id)
+
+    # Members
+    def build_members(self, rows, offset):
+        pairs = [(int(row['course_id']), self.user_id(int(row['user_id']))) for row in rows]
+        course_ids = set(Course.objects.filter(id__in={c for c, _ in pairs}).values_list('id', flat=True))
+        existing = set(CourseMember.objects.filter(
+            course_id__in=course_ids, user_id__in={u for _, u in pairs}).values_list('course_id', 'user_id'))
+        for (course_id, user_id), row in zip(pairs, rows):
+            key = (course_id, user_id)
+            if course_id not in course_ids or user_id is None or key in existing:
+                continue
+            existing.add(key)
+            yield CourseMember(course_id=course_id, user_id=user_id, roles=row['roles'])
+
+    # Contents
+    def build_contents(self, rows, offset):
+        ids = range(offset + 1, offset + len(rows) + 1)
+        existing = set(CourseContent.objects.filter(id__in=ids).values_list('id', flat=True))
+        course_ids = set(Course.objects.filter(
+            id__in={int(row['course_id']) for row in rows}).values_list('id', flat=True))
+        for num, row in zip(ids, rows):
+            course_id = int(row['course_id'])
+            if num in existing or course_id not in course_ids:
+                continue
+            yield CourseContent(id=num, course_id=course_id, video_url=row['video_url'],
+                                name=row['name'], description=row['description'])
+
+    # Comments
+    def build_comments(self, rows, offset):
+        ids = range(offset + 1, offset + len(rows) + 1)
+        existing = set(Comment.objects.filter(id__in=ids).values_list('id', flat=True))
+        content_course = dict(CourseContent.objects.filter(
+            id__in={int(row['content_id']) for row in rows}).values_list('id', 'course_id'))
+        members = {(c, u): m for m, c, u in CourseMember.objects.filter(
+            course_id__in=set(content_course.values()),
+            user_id__in={self.user_id(int(row['user_id'])) for row in rows},
+        ).values_list('id', 'course_id', 'user_id')}
+        for num, row in zip(ids, rows):
+            content_id = int(row['content_id'])
+            if num in existing:
+                continue
+            if content_id not in content_course:
+                self.stage.rejected['tanpa-konten'] += 1
+                continue
+            # Komentar hanya boleh dari member course konten tersebut
+            member_id = members.get((content_course[content_id], self.user_id(int(row['user_id']))))
+            if member_id is None:
+                self.stage.rejected['bukan-member'] += 1
+                continue
+            yield Comment(id=num, content_id=content_id, course_id=content_course[content_id],
+                          member_id=member_id, comment=row['comment'])
+
+    def reset_sequences(self):
+        # Id eksplisit tidak memajukan sequence di Postgres
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Course, CourseContent, Comment]):
+            with connection.cursor() as cursor:
+                cursor.execute(sql)
+
+    def run(self, stages=('users', 'courses', 'members', 'contents', 'comments')):
+        started = time.perf_counter()
+        results = []
+        if 'users' in stages:
+            if self.workers > 1:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_hash_worker)
+            try:
+                results.append(self._run_stage('users', 'user-data.csv', read_csv, self.build_users, User,
+                                               unit='user'))
+            finally:
+                if self.pool:
+                    self.pool.shutdown()
+                    self.pool = None
+        self.map_users()
+        if 'courses' in stages:
+            results.append(self._run_stage('courses', 'course-data.csv', read_csv, self.build_courses, Course))
+        if 'members' in stages:
+            results.append(self._run_stage('members', 'member-data.csv', read_csv, self.build_members,
+                                           CourseMember))
+        if 'contents' in stages:
+            results.append(self._run_stage('contents', 'contents.json', read_json, self.build_contents,
+                                           CourseContent))
+        if 'comments' in stages:
+            results.append(self._run_stage('comments', 'comments.json', read_json, self.build_comments, Comment))
+        self.reset_sequences()
+        # bulk_create tidak mengirim signal, jadi counter course, progres dan path konten dihitung ulang sekali di akhir
+        refresh_course_counters()
+        refresh_content_paths()
+        refresh_course_progress()
+        # Import selesai: checkpoint tidak dibutuhkan lagi (dan bisa menyesatkan jika database di-reset)
+        self.checkpoint.clear()
+        self.log(f"--- {time.perf_counter() - started:.2f} detik ---")
+        return results
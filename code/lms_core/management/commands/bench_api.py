@@ -0,0 +1,66 @@
+import json
+import logging
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from lms_core.benchmark import compare_with_baseline, run_benchmark, uncovered_routes
+
+
+class Command(BaseCommand):
+    help = "Benchmark semua route apiv1: jumlah query, latensi p50/p95/p99 dan ukuran response."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=1, help="Faktor ukuran dataset seed.")
+        parser.add_argument("--iterations", type=int, default=20, help="Jumlah request per route.")
+        parser.add_argument("--output", default="bench_report.json", help="File report JSON.")
+        parser.add_argument("--baseline", help="Report JSON lama untuk dibandingkan.")
+        parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="Toleransi kenaikan p95 terhadap baseline (0.25 = 25%%).")
+
+    def handle(self, *args, **options):
+        missing = uncovered_routes()
+        if missing:
+            raise CommandError(f"Route tanpa skenario benchmark: {', '.join(missing)}")
+
+        # Database test terpisah, database development tidak disentuh
+        # Response 4xx yang memang diharapkan skenario tidak perlu di-log
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            # Replica tidak ikut database test: semua baca ke primary. Snapshot sertifikat
+            # ke direktori sementara supaya tidak tercampur dengan milik database asli.
+            with tempfile.TemporaryDirectory() as certificates, \
+                    override_settings(LMS_DB_REPLICAS=[], LMS_CERTIFICATE_DIR=certificates):
+                report = run_benchmark(options["scale"], options["iterations"])
+        except AssertionError as e:
+            raise CommandError(str(e))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'route':<60} {'query':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'bytes':>8}")
+        for row in report["routes"]:
+            line = (f"{row['route']:<60} {row['queries']:>4}/{row['budget']:<4} {row['p50_ms']:>8.2f} "
+                    f"{row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['bytes']:>8}")
+            self.stdout.write(self.style.ERROR(line) if row["over_budget"] else line)
+
+        with open(options["output"], "w") as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f"Report ditulis ke {options['output']}")
+
+        failures = [f"{r['route']}: {r['queries']} query > budget {r['budget']}"
+                    for r in report["routes"] if r["over_budget"]]
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+            if baseline.get("scale") != report["scale"]:
+                self.stdout.write(self.style.WARNING(
+                    f"Baseline dibuat dengan --scale {baseline.get('scale')}, hasil tidak sebanding."))
+            failures += compare_with_baseline(report, baseline, options["tolerance"])
+        if failures:
+            raise CommandError("Benchmark gagal:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("Semua route dalam budget."))
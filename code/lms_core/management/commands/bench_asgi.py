@@ -0,0 +1,58 @@
+import asyncio
+import json
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from lms_core.benchmark import run_asgi_load, run_wsgi_load, seed
+
+NO_CACHE = {
+    alias: {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    for alias in ("default", "responses")
+}
+
+
+class Command(BaseCommand):
+    help = ("Bandingkan throughput route baca panas (handler async) lewat ASGIHandler "
+            "dan WSGIHandler pada beberapa tingkat konkurensi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=2, help="Faktor ukuran dataset seed.")
+        parser.add_argument("--concurrency", default="8,32", help="Daftar konkurensi, dipisah koma.")
+        parser.add_argument("--seconds", type=float, default=10, help="Durasi per pengukuran.")
+        parser.add_argument("--no-cache", action="store_true",
+                            help="Matikan cache (DummyCache) supaya tiap request benar-benar query database.")
+        parser.add_argument("--output", default="bench_asgi.json", help="File report JSON.")
+
+    def handle(self, *args, **options):
+        logging.getLogger("django.request").setLevel(logging.CRITICAL)
+        levels = [int(n) for n in options["concurrency"].split(",")]
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        rows = []
+        try:
+            ctx = seed(options["scale"])
+            overrides = {"LMS_DB_REPLICAS": []}
+            if options["no_cache"]:
+                overrides["CACHES"] = NO_CACHE
+            with override_settings(**overrides):
+                for concurrency in levels:
+                    rows.append({"handler": "wsgi", "concurrency": concurrency,
+                                 **run_wsgi_load(ctx, concurrency, options["seconds"])})
+                    rows.append({"handler": "asgi", "concurrency": concurrency,
+                                 **asyncio.run(run_asgi_load(ctx, concurrency, options["seconds"]))})
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'handler':<8} {'konkuren':>8} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'error':>6}")
+        for row in rows:
+            self.stdout.write(f"{row['handler']:<8} {row['concurrency']:>8} {row['rps']:>8} {str(row['p50_ms']):>8} "
+                              f"{str(row['p95_ms']):>8} {str(row['p99_ms']):>8} {row['errors']:>6}")
+        report = {"scale": options["scale"], "seconds": options["seconds"], "no_cache": options["no_cache"],
+                  "runs": rows}
+        with open(options["output"], "w") as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f"Report ditulis ke {options['output']}")
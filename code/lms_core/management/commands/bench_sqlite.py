@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from lms_core.benchmark import run_concurrent_mix, seed
+from lms_core.sqlite import profile_options
+
+MODES = [
+    # (nama, pakai PRAGMA profil, pakai antrian tulis)
+    ("default", False, False),
+    ("profile", True, False),
+    ("profile+queue", True, True),
+]
+
+
+class Command(BaseCommand):
+    help = ("Benchmark throughput baca/tulis konkuren di SQLite, dengan dan tanpa profil "
+            "LMS_SQLITE_PROFILE (WAL, synchronous=NORMAL, mmap, cache, busy_timeout, antrian tulis).")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=1, help="Faktor ukuran dataset seed.")
+        parser.add_argument("--threads", type=int, default=8, help="Jumlah thread klien.")
+        parser.add_argument("--seconds", type=float, default=10, help="Durasi per mode.")
+        parser.add_argument("--write-ratio", type=float, default=0.2, help="Porsi request tulis (0-1).")
+        parser.add_argument("--output", default="bench_sqlite.json", help="File report JSON.")
+
+    def run_mode(self, name, use_profile, use_queue, options):
+        # Tiap mode memakai file database baru supaya hasil tidak saling memengaruhi
+        workdir = tempfile.mkdtemp(prefix="lms-bench-sqlite-")
+        db = connection.settings_dict
+        connection.close()
+        db["NAME"] = os.path.join(workdir, "db.sqlite3")
+        db["OPTIONS"] = profile_options(settings.LMS_SQLITE_PRAGMAS) if use_profile else {}
+        try:
+            call_command("migrate", verbosity=0)
+            ctx = seed(options["scale"])
+            connection.close()
+            # Replica (bila dikonfigurasi) tidak ikut file sementara: semua baca ke primary
+            with override_settings(LMS_SQLITE_WRITE_QUEUE=use_queue, LMS_DB_REPLICAS=[],
+                                   LMS_CERTIFICATE_DIR=os.path.join(workdir, "certificates")):
+                result = run_concurrent_mix(ctx, options["threads"], options["seconds"], options["write_ratio"])
+            journal = connection.cursor().execute("PRAGMA journal_mode").fetchone()[0]
+        finally:
+            connection.close()
+            shutil.rmtree(workdir, ignore_errors=True)
+        return {"mode": name, "journal_mode": journal, "write_queue": use_queue, **result}
+
+    def handle(self, *args, **options):
+        logging.getLogger("django.request").setLevel(logging.CRITICAL)
+        db = connection.settings_dict
+        original = {"NAME": db["NAME"], "OPTIONS": db.get("OPTIONS", {})}
+        setup_test_environment()
+        try:
+            rows = [self.run_mode(name, use_profile, use_queue, options) for name, use_profile, use_queue in MODES]
+        finally:
+            connection.close()
+            db.update(original)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'mode':<15} {'baca/s':>8} {'tulis/s':>8} {'p95 baca':>9} {'p95 tulis':>10} "
+                          f"{'p99 tulis':>10} {'error':>6} {'locked':>7}")
+        for row in rows:
+            read, write = row["read"], row["write"]
+            self.stdout.write(f"{row['mode']:<15} {read['rps']:>8} {write['rps']:>8} {str(read['p95_ms']):>9} "
+                              f"{str(write['p95_ms']):>10} {str(write['p99_ms']):>10} {row['errors']:>6} "
+                              f"{row['locked_errors']:>7}")
+
+        report = {"scale": options["scale"], "threads": options["threads"], "seconds": options["seconds"],
+                  "write_ratio": options["write_ratio"], "modes": rows}
+        with open(options["output"], "w") as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f"Report ditulis ke {options['output']}")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from lms_core.generator import DEFAULT_BATCH_SIZE, DEFAULT_PASSWORD, LmsDataGenerator
+
+
+class Command(BaseCommand):
+    help = "Buat dataset LMS sintetis yang deterministik untuk uji skala (bulk insert langsung ke database)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=1,
+                            help="Faktor ukuran; scale 1 kira-kira 1.000 user dan 40 course.")
+        parser.add_argument("--seed", type=int, default=42, help="Seed random; seed sama = data sama.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password semua user yang dibuat.")
+
+    def handle(self, *args, **options):
+        generator = LmsDataGenerator(scale=options["scale"], seed=options["seed"], batch_size=options["batch_size"],
+                                     password=options["password"], log=self.stdout.write)
+        try:
+            generator.run()
+        except ValueError as e:
+            raise CommandError(str(e))
@@ -0,0 +1,37 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from lms_core.importer import DEFAULT_BATCH_SIZE, DEFAULT_CHUNK_SIZE, LmsImporter
+
+STAGES = ['users', 'courses', 'members', 'contents', 'comments']
+CHECKPOINT_FILE = '.import_lms.checkpoint.json'
+
+
+class Command(BaseCommand):
+    help = "Import data LMS (user, course, member, konten, komentar) dari folder csv_data secara bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="./csv_data/", help="Folder berisi file CSV/JSON sumber.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                            help="Jumlah baris per transaksi/checkpoint.")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Jumlah proses untuk hashing password (default: semua core).")
+        parser.add_argument("--prehashed", action="store_true",
+                            help="Kolom password yang sudah berupa hash Django dipakai apa adanya.")
+        parser.add_argument("--checkpoint", default=None,
+                            help=f"File checkpoint (default: <path>/{CHECKPOINT_FILE}).")
+        parser.add_argument("--restart", action="store_true",
+                            help="Abaikan checkpoint dan mulai dari awal.")
+        parser.add_argument("--only", nargs="+", choices=STAGES, default=STAGES,
+                            help="Hanya jalankan stage tertentu.")
+
+    def handle(self, *args, **options):
+        checkpoint = options["checkpoint"] or os.path.join(options["path"], CHECKPOINT_FILE)
+        importer = LmsImporter(options["path"], batch_size=options["batch_size"], chunk_size=options["chunk_size"],
+                               workers=options["workers"], prehashed=options["prehashed"],
+                               checkpoint=checkpoint, log=self.stdout.write)
+        if options["restart"]:
+            importer.checkpoint.clear()
+        importer.run(stages=options["only"])
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from lms_core.models import Course, refresh_content_paths, refresh_course_counters, refresh_course_progress
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang counter member/konten/komentar/feedback pada tabel Course, progres user dan path pohon konten."
+
+    def add_arguments(self, parser):
+        parser.add_argument("course_ids", nargs="*", type=int, help="Batasi ke course tertentu.")
+
+    def handle(self, *args, **options):
+        courses = Course.objects.all()
+        if options["course_ids"]:
+            courses = courses.filter(id__in=options["course_ids"])
+        updated = refresh_course_counters(courses)
+        refresh_course_progress(options["course_ids"] or None)
+        refresh_content_paths(options["course_ids"] or None)
+        self.stdout.write(self.style.SUCCESS(f"{updated} course diperbarui."))
@@ -0,0 +1,53 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from lms_core.certificates import existing_snapshots, render_snapshots
+from lms_core.models import CourseCompletion
+
+
+def _init_worker():
+    # Proses anak (spawn) perlu memuat Django sendiri; dengan fork ini tidak melakukan apa-apa
+    django.setup()
+
+
+def _render_chunk(ids):
+    return render_snapshots(ids, force=True)
+
+
+class Command(BaseCommand):
+    help = ("Render snapshot HTML sertifikat untuk completion yang belum punya snapshot "
+            "(mis. data hasil bulk_create atau import), paralel di beberapa proses worker.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Jumlah proses worker.")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Completion per tugas worker.")
+        parser.add_argument("--force", action="store_true", help="Render ulang snapshot yang sudah ada.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        ids = list(CourseCompletion.objects.order_by("id").values_list("id", flat=True))
+        if not options["force"]:
+            existing = existing_snapshots()
+            ids = [pk for pk in ids if pk not in existing]
+        size = options["chunk_size"]
+        chunks = [ids[i:i + size] for i in range(0, len(ids), size)]
+        written = 0
+        if options["workers"] <= 1:
+            for chunk in chunks:
+                written += _render_chunk(chunk)
+        else:
+            # Koneksi database tidak boleh ikut diwariskan ke proses anak
+            connections.close_all()
+            with ProcessPoolExecutor(options["workers"], initializer=_init_worker) as pool:
+                for done, count in enumerate(pool.map(_render_chunk, chunks), start=1):
+                    written += count
+                    if done % 20 == 0:
+                        self.stdout.write(f"{done}/{len(chunks)} batch, {written} snapshot")
+        seconds = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{written} snapshot sertifikat ditulis dalam {seconds:.2f} detik ({options['workers']} worker)."))
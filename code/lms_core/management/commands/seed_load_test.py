@@ -0,0 +1,47 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from lms_core.benchmark import BENCH_PASSWORD, seed
+from lms_core.models import Comment, Course, CourseContent, CourseMember
+
+
+class Command(BaseCommand):
+    help = "Seed dataset benchmark dan tulis pool user untuk load test Locust (load_test/locust_file.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=5, help="Faktor ukuran dataset seed.")
+        parser.add_argument("--output", default="../load_test/user_pool.json", help="File pool user JSON.")
+
+    def handle(self, *args, **options):
+        teacher = User.objects.filter(username="bench_teacher").first()
+        if teacher is None:
+            ctx = seed(options["scale"])
+            teacher, course = ctx["teacher"], ctx["course"]
+            self.stdout.write(f"Dataset benchmark dibuat (scale {options['scale']}).")
+        else:
+            # Seed sudah ada: pool ditulis ulang dari database
+            course = Course.objects.filter(teacher=teacher).order_by("id").first()
+            if course is None:
+                raise CommandError("bench_teacher ada tetapi tidak punya course; reset database dulu.")
+            self.stdout.write("Dataset benchmark sudah ada, seed dilewati.")
+
+        students = list(CourseMember.objects.filter(course=course, user__is_staff=False)
+                        .order_by("user_id").values_list("user__username", flat=True))
+        pool = {
+            "password": BENCH_PASSWORD,
+            "students": students,
+            "teachers": [teacher.username],
+            "moderators": list(User.objects.filter(is_staff=True, username__startswith="bench_")
+                               .values_list("username", flat=True)),
+            "course_id": course.id,
+            "courses": list(Course.objects.filter(teacher=teacher).order_by("id").values_list("id", flat=True)),
+            "contents": list(CourseContent.objects.filter(course=course).order_by("id").values_list("id", flat=True)),
+            "comments": list(Comment.objects.filter(course=course).order_by("id")
+                             .values_list("id", flat=True)),
+        }
+        with open(options["output"], "w") as f:
+            json.dump(pool, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f"Pool ditulis ke {options['output']}: {len(students)} student, {len(pool['moderators'])} moderator."))
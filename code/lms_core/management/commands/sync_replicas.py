@@ -0,0 +1,41 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = ("Salin database primary SQLite ke replica di LMS_DB_REPLICAS (pengganti replikasi "
+            "untuk development). Dengan --interval, salin berulang untuk mensimulasikan lag replica.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, help="Ulangi tiap N detik sampai dihentikan (Ctrl+C).")
+
+    def sync(self):
+        primary = connections.databases[DEFAULT_DB_ALIAS]
+        source = sqlite3.connect(primary["NAME"])
+        try:
+            for alias in settings.LMS_DB_REPLICAS:
+                started = time.perf_counter()
+                target = sqlite3.connect(connections.databases[alias]["NAME"])
+                try:
+                    # Backup API: salinan konsisten walau primary sedang ditulis
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"{alias}: disalin dalam {time.perf_counter() - started:.2f} detik")
+        finally:
+            source.close()
+
+    def handle(self, *args, **options):
+        if not settings.LMS_DB_REPLICAS:
+            raise CommandError("LMS_DB_REPLICAS kosong: tidak ada replica yang dikonfigurasi.")
+        engines = {connections.databases[a]["ENGINE"] for a in [DEFAULT_DB_ALIAS, *settings.LMS_DB_REPLICAS]}
+        if engines != {"django.db.backends.sqlite3"}:
+            raise CommandError("sync_replicas hanya untuk SQLite; replikasi database lain diatur di server database.")
+        self.sync()
+        while options["interval"]:
+            time.sleep(options["interval"])
+            self.sync()
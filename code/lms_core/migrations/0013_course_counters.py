@@ -0,0 +1,63 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:11
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_course_counters(apps, schema_editor):
+    Course = apps.get_model('lms_core', 'Course')
+    CourseMember = apps.get_model('lms_core', 'CourseMember')
+    CourseContent = apps.get_model('lms_core', 'CourseContent')
+    Comment = apps.get_model('lms_core', 'Comment')
+    CourseFeedback = apps.get_model('lms_core', 'CourseFeedback')
+
+    def aggregate(model, group, expression, **filters):
+        return Coalesce(Subquery(
+            model.objects.filter(**{group: OuterRef('pk')}, **filters).order_by()
+            .values(group).annotate(value=expression).values('value')
+        ), Value(0))
+
+    Course.objects.update(
+        member_count=aggregate(CourseMember, 'course', Count('pk')),
+        content_count=aggregate(CourseContent, 'course', Count('pk')),
+        comment_count=aggregate(Comment, 'content__course', Count('pk'), is_moderated=True),
+        feedback_count=aggregate(CourseFeedback, 'course', Count('pk')),
+        rating_sum=aggregate(CourseFeedback, 'course', Sum('rating')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0012_course_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Jumlah Komentar Dimoderasi'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='content_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Jumlah Konten'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='feedback_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Jumlah Feedback'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='member_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Jumlah Member'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='rating_sum',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Total Rating'),
+        ),
+        migrations.RunPython(fill_course_counters, migrations.RunPython.noop),
+    ]
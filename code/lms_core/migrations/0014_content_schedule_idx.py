@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0013_course_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coursecontent',
+            index=models.Index(fields=['course', 'release_date', 'end_date'], name='content_schedule_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_course_progress(apps, schema_editor):
+    CourseProgress = apps.get_model('lms_core', 'CourseProgress')
+    CourseContent = apps.get_model('lms_core', 'CourseContent')
+    CourseContentCompletion = apps.get_model('lms_core', 'CourseContentCompletion')
+
+    totals = dict(CourseContent.objects.order_by().values('course_id').annotate(n=Count('pk'))
+                  .values_list('course_id', 'n'))
+    rows = CourseContentCompletion.objects.order_by().values('user_id', 'content__course_id').annotate(n=Count('pk'))
+    CourseProgress.objects.bulk_create([
+        CourseProgress(user_id=row['user_id'], course_id=row['content__course_id'], completed_contents=row['n'],
+                       total_contents=totals.get(row['content__course_id'], 0))
+        for row in rows.iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0014_content_schedule_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed_contents', models.PositiveIntegerField(default=0, verbose_name='Konten Selesai')),
+                ('total_contents', models.PositiveIntegerField(default=0, verbose_name='Total Konten')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='lms_core.course', verbose_name='matkul')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Pengguna')),
+            ],
+            options={
+                'verbose_name': 'Progres Matkul',
+                'verbose_name_plural': 'Progres Matkul',
+                'unique_together': {('user', 'course')},
+            },
+        ),
+        migrations.RunPython(fill_course_progress, migrations.RunPython.noop),
+    ]
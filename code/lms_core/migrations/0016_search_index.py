@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    from lms_core.search import ensure_search_index
+    ensure_search_index(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    from lms_core.search import drop_search_index
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0015_course_progress'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
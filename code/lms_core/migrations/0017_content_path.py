@@ -0,0 +1,40 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:05
+
+from django.db import migrations, models
+
+
+def fill_content_paths(apps, schema_editor):
+    CourseContent = apps.get_model('lms_core', 'CourseContent')
+
+    parents = dict(CourseContent.objects.values_list('id', 'parent_id').iterator())
+    paths = {}
+    for pk in parents:
+        chain, node = [], pk
+        while node in parents and node not in paths and node not in chain:
+            chain.append(node)
+            node = parents[node]
+        prefix = paths.get(node, '')
+        for node in reversed(chain):
+            prefix = paths[node] = f"{prefix}{node:010d}/"
+    CourseContent.objects.bulk_update([CourseContent(id=pk, path=path) for pk, path in paths.items()], ['path'],
+                                      batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0016_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursecontent',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255, verbose_name='path pohon'),
+        ),
+        migrations.RunPython(fill_content_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='coursecontent',
+            index=models.Index(fields=['course', 'path'], name='content_path_idx'),
+        ),
+    ]
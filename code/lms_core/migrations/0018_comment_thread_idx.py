@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0017_content_path'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['content', 'is_moderated', 'created_at', 'id'], name='comment_thread_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0018_comment_thread_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['is_moderated', 'created_at'], name='comment_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_comment_course(apps, schema_editor):
+    Comment = apps.get_model('lms_core', 'Comment')
+    CourseContent = apps.get_model('lms_core', 'CourseContent')
+
+    Comment.objects.update(course_id=models.Subquery(
+        CourseContent.objects.filter(pk=models.OuterRef('content_id')).values('course_id')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0019_comment_queue_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='course',
+            field=models.ForeignKey(db_index=False, editable=False, null=True,
+                                    on_delete=django.db.models.deletion.CASCADE, to='lms_core.course',
+                                    verbose_name='kursus'),
+        ),
+        migrations.RunPython(fill_comment_course, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='comment',
+            name='course',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE,
+                                    to='lms_core.course', verbose_name='kursus'),
+        ),
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_queue_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['course', 'is_moderated', 'created_at', 'id'], name='comment_course_queue_idx'),
+        ),
+    ]
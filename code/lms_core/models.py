@@ -1,9 +1,16 @@
 import datetime
+from collections import Counter
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Concat, Substr
+from .certificates import delete_snapshot, render_snapshots
+from .db_router import use_primary
+from .response_cache import invalidate_tags, response_cache
+from .search import ensure_search_index
 from .utils import get_current_timestamp
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save, pre_save
 from django.dispatch import receiver
 
 
@@ -17,6 +24,12 @@ class Course(models.Model):
     image = models.ImageField("Gambar", upload_to="course", blank=True, null=True)
     teacher = models.ForeignKey(User, verbose_name="Pengajar", on_delete=models.RESTRICT)
     max_students = models.IntegerField("Maksimal Siswa", null=True, blank=True)
+    # Counter denormalisasi, diperbarui lewat signal di bawah (lihat refresh_course_counters)
+    member_count = models.IntegerField("Jumlah Member", default=0, editable=False)
+    content_count = models.IntegerField("Jumlah Konten", default=0, editable=False)
+    comment_count = models.IntegerField("Jumlah Komentar Dimoderasi", default=0, editable=False)
+    feedback_count = models.IntegerField("Jumlah Feedback", default=0, editable=False)
+    rating_sum = models.IntegerField("Total Rating", default=0, editable=False)
     created_at = models.DateTimeField("Dibuat pada", auto_now_add=True)
     updated_at = models.DateTimeField("Diperbarui pada", auto_now=True)
 
@@ -24,10 +37,26 @@ class Course(models.Model):
         verbose_name = "Mata Kuliah"
         verbose_name_plural = "Data Mata Kuliah"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="course_created_id_idx"),
+        ]
+
+    COUNTER_FIELDS = ('member_count', 'content_count', 'comment_count', 'feedback_count', 'rating_sum')
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Counter hanya ditulis lewat UPDATE F() (signal, refresh_course_counters). Save biasa
+        # dari instance yang dimuat lebih awal tidak boleh menimpanya dengan nilai lama.
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS and f.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
     def is_member(self, user):
         return CourseMember.objects.filter(course=self, user=user).exists()
 
@@ -67,16 +96,33 @@ class CourseContent(models.Model):
     parent = models.ForeignKey("self", verbose_name="induk", on_delete=models.RESTRICT, null=True, blank=True)
     release_date = models.DateTimeField("Tanggal Rilis", null=True, blank=True)
     end_date = models.DateTimeField("Tanggal Berakhir", null=True, blank=True)
+    # Materialized path "id-root/.../id-sendiri/", dijaga signal di bawah (lihat CONTENT TREE)
+    path = models.CharField("path pohon", max_length=255, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Konten Matkul"
         verbose_name_plural = "Konten Matkul"
+        indexes = [
+            models.Index(fields=["course", "release_date", "end_date"], name="content_schedule_idx"),
+            models.Index(fields=["course", "path"], name="content_path_idx"),
+        ]
 
     def __str__(self):
         return f'{self.course.name} {self.name}'
 
+    def save(self, *args, **kwargs):
+        # path hanya ditulis lewat UPDATE di signal CONTENT TREE: pemindahan induk menulis ulang
+        # path seluruh subtree, jadi path di instance lama bisa basi dan tidak boleh ikut disimpan
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != 'path' and f.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
 
 
 # =====================
@@ -84,6 +130,10 @@ class CourseContent(models.Model):
 # =====================
 class Comment(models.Model):
     content = models.ForeignKey(CourseContent, verbose_name="konten", on_delete=models.CASCADE)
+    # Salinan content.course (diisi signal pre_save; bulk_create harus mengisinya sendiri)
+    # supaya antrian moderasi per course bisa memakai index tanpa JOIN ke konten
+    course = models.ForeignKey(Course, verbose_name="kursus", on_delete=models.CASCADE,
+                               editable=False, db_index=False)
     member = models.ForeignKey(CourseMember, verbose_name="pengguna", on_delete=models.CASCADE)
     comment = models.TextField('komentar')
     is_moderated = models.BooleanField("Sudah Dimoderasi", default=False)
@@ -93,6 +143,12 @@ class Comment(models.Model):
     class Meta:
         verbose_name = "Komentar"
         verbose_name_plural = "Komentar"
+        indexes = [
+            # Thread komentar per konten: halaman keyset (created_at, id) menjadi range scan terbatas
+            models.Index(fields=["content", "is_moderated", "created_at", "id"], name="comment_thread_idx"),
+            # Antrian moderasi per course: komentar belum dimoderasi, tertua dulu
+            models.Index(fields=["course", "is_moderated", "created_at", "id"], name="comment_course_queue_idx"),
+        ]
 
     def __str__(self):
         return "Komen: " + self.member.user.username + " - " + self.comment
@@ -134,6 +190,40 @@ class CourseCompletion(models.Model):
 
 
 
+# =====================
+# COURSE PROGRESS
+# =====================
+class CourseProgress(models.Model):
+    """
+    Progres satu user pada satu course. Dijaga incremental oleh signal
+    completion/konten, jadi cek selesai tidak perlu menghitung ulang tabel.
+    """
+    user = models.ForeignKey(User, verbose_name="Pengguna", on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, verbose_name="matkul", on_delete=models.CASCADE)
+    completed_contents = models.PositiveIntegerField("Konten Selesai", default=0)
+    total_contents = models.PositiveIntegerField("Total Konten", default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Progres Matkul"
+        verbose_name_plural = "Progres Matkul"
+        unique_together = ('user', 'course')
+
+    def __str__(self):
+        return f"{self.user_id} - {self.course_id}: {self.completed_contents}/{self.total_contents}"
+
+    @property
+    def is_completed(self):
+        return self.total_contents > 0 and self.completed_contents >= self.total_contents
+
+    @property
+    def percentage(self):
+        if not self.total_contents:
+            return 0.0
+        return round(min(self.completed_contents, self.total_contents) * 100 / self.total_contents, 2)
+
+
+
 # =====================
 # ANNOUNCEMENT
 # =====================
@@ -188,4 +278,448 @@ class CourseFeedback(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"{self.user.username} feedback for {self.course.name}"
\ No newline at end of file
+        return f"{self.user.username} feedback for {self.course.name}"
+
+
+
+# =====================
+# COURSE COUNTERS
+# =====================
+def _bump_course(course_filter, **deltas):
+    # UPDATE ... SET x = x + delta: atomik walau banyak request bersamaan
+    Course.objects.filter(**course_filter).update(**{f: F(f) + d for f, d in deltas.items() if d})
+
+
+def _aggregate(model, group, expression, **filters):
+    # Subquery agregat per baris luar (korelasi lewat OuterRef('pk')), 0 jika kosong
+    return Coalesce(Subquery(
+        model.objects.filter(**{group: OuterRef('pk')}, **filters).order_by()
+        .values(group).annotate(value=expression).values('value')
+    ), Value(0))
+
+
+def refresh_course_counters(courses=None):
+    """
+    Hitung ulang semua counter course dari tabel sumber dalam satu UPDATE.
+    Dipakai setelah bulk_create (yang tidak mengirim signal) dan oleh
+    command `recount_course_stats`.
+    """
+    courses = Course.objects.all() if courses is None else courses
+    return courses.update(
+        member_count=_aggregate(CourseMember, 'course', Count('pk')),
+        content_count=_aggregate(CourseContent, 'course', Count('pk')),
+        comment_count=_aggregate(Comment, 'course', Count('pk'), is_moderated=True),
+        feedback_count=_aggregate(CourseFeedback, 'course', Count('pk')),
+        rating_sum=_aggregate(CourseFeedback, 'course', Sum('rating')),
+    )
+
+
+@receiver(post_save, sender=CourseMember)
+def count_member_created(sender, instance, created, **kwargs):
+    if created:
+        _bump_course({'pk': instance.course_id}, member_count=1)
+
+
+@receiver(post_delete, sender=CourseMember)
+def count_member_deleted(sender, instance, **kwargs):
+    _bump_course({'pk': instance.course_id}, member_count=-1)
+
+
+@receiver(post_save, sender=CourseContent)
+def count_content_created(sender, instance, created, **kwargs):
+    if created:
+        _bump_course({'pk': instance.course_id}, content_count=1)
+
+
+@receiver(post_delete, sender=CourseContent)
+def count_content_deleted(sender, instance, **kwargs):
+    _bump_course({'pk': instance.course_id}, content_count=-1)
+
+
+@receiver(pre_save, sender=Comment)
+def copy_comment_course(sender, instance, **kwargs):
+    # Comment.course selalu mengikuti course kontennya
+    if Comment.content.is_cached(instance):
+        instance.course_id = instance.content.course_id
+    else:
+        instance.course_id = CourseContent.objects.filter(pk=instance.content_id) \
+            .values_list('course_id', flat=True).first()
+
+
+# Nilai terakhir yang sudah masuk counter. Dibaca dari __dict__ supaya field yang
+# di-defer tidak memicu query; nilai None berarti tidak diketahui dan dilewati
+# (recount_course_stats yang membetulkan).
+@receiver(post_init, sender=Comment)
+def remember_comment_moderation(sender, instance, **kwargs):
+    instance._counted_moderated = instance.__dict__.get('is_moderated') if instance.pk else False
+
+
+@receiver(post_save, sender=Comment)
+def count_comment_saved(sender, instance, **kwargs):
+    if instance._counted_moderated is not None and instance.is_moderated != instance._counted_moderated:
+        _bump_course({'pk': instance.course_id}, comment_count=1 if instance.is_moderated else -1)
+        instance._counted_moderated = instance.is_moderated
+
+
+@receiver(post_delete, sender=Comment)
+def count_comment_deleted(sender, instance, **kwargs):
+    if instance._counted_moderated:
+        _bump_course({'pk': instance.course_id}, comment_count=-1)
+
+
+def moderate_comments(comment_ids, is_moderated, teacher_id=None):
+    """
+    Set is_moderated banyak komentar dengan satu UPDATE ... WHERE id IN. Hanya
+    baris yang statusnya berubah yang disentuh; karena tanpa signal per baris,
+    counter course dan cache response diperbarui sekali untuk seluruh batch.
+    `teacher_id` membatasi ke komentar pada course milik pengajar tersebut.
+    Mengembalikan id komentar yang berubah.
+    """
+    comments = Comment.objects.filter(id__in=comment_ids).exclude(is_moderated=is_moderated)
+    if teacher_id is not None:
+        comments = comments.filter(course__teacher_id=teacher_id)
+    with transaction.atomic():
+        rows = list(comments.select_for_update(of=('self',)).order_by('id')
+                    .values_list('id', 'content_id', 'course_id'))
+        if not rows:
+            return []
+        ids = [pk for pk, _, _ in rows]
+        Comment.objects.filter(id__in=ids).update(is_moderated=is_moderated, updated_at=get_current_timestamp())
+        delta = 1 if is_moderated else -1
+        per_course = Counter(course_id for _, _, course_id in rows)
+        Course.objects.filter(pk__in=per_course).update(comment_count=F('comment_count') + Case(
+            *[When(pk=course_id, then=Value(n * delta)) for course_id, n in per_course.items()], default=Value(0)))
+        invalidate_tags(*{f"content:{content_id}:comments" for _, content_id, _ in rows})
+    return ids
+
+
+@receiver(post_init, sender=CourseFeedback)
+def remember_feedback_rating(sender, instance, **kwargs):
+    instance._counted_rating = instance.__dict__.get('rating') if instance.pk else None
+
+
+@receiver(post_save, sender=CourseFeedback)
+def count_feedback_saved(sender, instance, created, **kwargs):
+    if created:
+        _bump_course({'pk': instance.course_id}, feedback_count=1, rating_sum=instance.rating)
+    elif instance._counted_rating is not None and instance.rating != instance._counted_rating:
+        _bump_course({'pk': instance.course_id}, rating_sum=instance.rating - instance._counted_rating)
+    instance._counted_rating = instance.rating
+
+
+@receiver(post_delete, sender=CourseFeedback)
+def count_feedback_deleted(sender, instance, **kwargs):
+    _bump_course({'pk': instance.course_id}, feedback_count=-1, rating_sum=-(instance._counted_rating or 0))
+
+
+
+# =====================
+# USER ACTIVITY
+# =====================
+def user_activity_cache_key(user_id):
+    return f"user-activity:{user_id}"
+
+
+def get_user_activity(user_id):
+    """
+    Ringkasan aktivitas user, dihitung dalam satu query (subquery per tabel)
+    lalu disimpan di cache sampai ada perubahan (lihat signal di bawah).
+    Cache bersama antar worker (alias response cache), supaya invalidasi dari
+    satu worker berlaku di semua. Mengembalikan None jika user tidak ada.
+    """
+    key = user_activity_cache_key(user_id)
+    activity = response_cache().get(key)
+    if activity is None:
+        # Diisi dari primary: cache ini berumur panjang, data replica bisa tertinggal
+        with use_primary():
+            activity = User.objects.filter(pk=user_id).annotate(
+                courses_joined=_aggregate(CourseMember, 'user', Count('pk')),
+                courses_as_student=_aggregate(CourseMember, 'user', Count('pk'), roles='std'),
+                courses_created_as_teacher=_aggregate(Course, 'teacher', Count('pk')),
+                comments_written=_aggregate(Comment, 'member__user', Count('pk')),
+                content_completed=_aggregate(CourseContentCompletion, 'user', Count('pk')),
+            ).values(
+                'id', 'username', 'email', 'courses_joined', 'courses_as_student',
+                'courses_created_as_teacher', 'comments_written', 'content_completed',
+            ).first()
+        if activity is None:
+            return None
+        response_cache().set(key, activity, settings.LMS_USER_ACTIVITY_CACHE_TIMEOUT)
+    return activity
+
+
+def _forget_user_activity(user_id):
+    response_cache().delete(user_activity_cache_key(user_id))
+
+
+@receiver(post_save, sender=CourseMember)
+@receiver(post_delete, sender=CourseMember)
+@receiver(post_save, sender=CourseContentCompletion)
+@receiver(post_delete, sender=CourseContentCompletion)
+def user_activity_changed(sender, instance, **kwargs):
+    _forget_user_activity(instance.user_id)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def teacher_activity_changed(sender, instance, created=True, **kwargs):
+    if created:
+        _forget_user_activity(instance.teacher_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_activity_changed(sender, instance, created=True, **kwargs):
+    if created:
+        if Comment.member.is_cached(instance):
+            user_id = instance.member.user_id
+        else:
+            user_id = CourseMember.objects.filter(pk=instance.member_id).values_list('user_id', flat=True).first()
+        _forget_user_activity(user_id)
+
+
+
+# =====================
+# CONTENT SCHEDULING
+# =====================
+def course_contents_cache_key(course_id):
+    return f"course-contents:{course_id}"
+
+
+@receiver(post_save, sender=CourseContent)
+@receiver(post_delete, sender=CourseContent)
+def course_contents_changed(sender, instance, **kwargs):
+    response_cache().delete(course_contents_cache_key(instance.course_id))
+
+
+@receiver(post_save, sender=Course)
+def course_summary_changed(sender, instance, **kwargs):
+    # Ringkasan course ikut di-nest pada tiap konten yang di-cache
+    response_cache().delete(course_contents_cache_key(instance.pk))
+
+
+# =====================
+# RESPONSE CACHE TAGS
+# =====================
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_responses(sender, instance, **kwargs):
+    invalidate_tags("courses", f"course:{instance.pk}")
+
+
+@receiver(post_save, sender=CourseContent)
+@receiver(post_delete, sender=CourseContent)
+def invalidate_content_responses(sender, instance, **kwargs):
+    invalidate_tags(f"course:{instance.course_id}:contents")
+
+
+@receiver(post_save, sender=CourseAnnouncement)
+@receiver(post_delete, sender=CourseAnnouncement)
+def invalidate_announcement_responses(sender, instance, **kwargs):
+    invalidate_tags(f"course:{instance.course_id}:announcements")
+
+
+@receiver(post_save, sender=CourseFeedback)
+@receiver(post_delete, sender=CourseFeedback)
+def invalidate_feedback_responses(sender, instance, **kwargs):
+    invalidate_tags(f"course:{instance.course_id}:feedbacks")
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_responses(sender, instance, **kwargs):
+    invalidate_tags(f"content:{instance.content_id}:comments")
+
+
+# =====================
+# COURSE PROGRESS SYNC
+# =====================
+def refresh_course_progress(course_ids=None):
+    """
+    Bangun ulang baris CourseProgress dari tabel completion. Dipakai setelah
+    bulk_create (tanpa signal) dan oleh command `recount_course_stats`.
+    """
+    progress = CourseProgress.objects.all()
+    completions = CourseContentCompletion.objects.all()
+    contents = CourseContent.objects.all()
+    if course_ids is not None:
+        progress = progress.filter(course_id__in=course_ids)
+        completions = completions.filter(content__course_id__in=course_ids)
+        contents = contents.filter(course_id__in=course_ids)
+    totals = dict(contents.order_by().values('course_id').annotate(n=Count('pk')).values_list('course_id', 'n'))
+    rows = completions.order_by().values('user_id', 'content__course_id').annotate(n=Count('pk'))
+    with transaction.atomic():
+        progress.delete()
+        CourseProgress.objects.bulk_create([
+            CourseProgress(user_id=row['user_id'], course_id=row['content__course_id'], completed_contents=row['n'],
+                           total_contents=totals.get(row['content__course_id'], 0))
+            for row in rows.iterator()
+        ], batch_size=1000)
+
+
+def get_course_progress(user_id, course_id):
+    """Progres user pada course (belum disimpan bila belum ada completion), None bila course tidak ada."""
+    progress = CourseProgress.objects.filter(user_id=user_id, course_id=course_id).first()
+    if progress is None:
+        # Belum ada completion: progres nol terhadap jumlah konten saat ini
+        total = Course.objects.filter(pk=course_id).values_list('content_count', flat=True).first()
+        if total is None:
+            return None
+        progress = CourseProgress(user_id=user_id, course_id=course_id, total_contents=total)
+    return progress
+
+
+@receiver(post_save, sender=CourseContentCompletion)
+def progress_completion_added(sender, instance, created, **kwargs):
+    if not created:
+        return
+    course_id = instance.content.course_id
+    updated = CourseProgress.objects.filter(user_id=instance.user_id, course_id=course_id) \
+        .update(completed_contents=F('completed_contents') + 1, updated_at=get_current_timestamp())
+    if not updated:
+        # Completion pertama user di course ini: baris dibuat dari hitungan sumber (sekali saja)
+        CourseProgress.objects.get_or_create(user_id=instance.user_id, course_id=course_id, defaults={
+            'completed_contents': CourseContentCompletion.objects.filter(
+                user_id=instance.user_id, content__course_id=course_id).count(),
+            'total_contents': CourseContent.objects.filter(course_id=course_id).count(),
+        })
+
+
+@receiver(post_delete, sender=CourseContentCompletion)
+def progress_completion_removed(sender, instance, **kwargs):
+    CourseProgress.objects.filter(
+        user_id=instance.user_id, course_id=instance.content.course_id, completed_contents__gt=0
+    ).update(completed_contents=F('completed_contents') - 1, updated_at=get_current_timestamp())
+
+
+@receiver(post_save, sender=CourseContent)
+def progress_content_added(sender, instance, created, **kwargs):
+    if created:
+        CourseProgress.objects.filter(course_id=instance.course_id) \
+            .update(total_contents=F('total_contents') + 1)
+
+
+@receiver(post_delete, sender=CourseContent)
+def progress_content_removed(sender, instance, **kwargs):
+    CourseProgress.objects.filter(course_id=instance.course_id, total_contents__gt=0) \
+        .update(total_contents=F('total_contents') - 1)
+
+
+# =====================
+# CONTENT TREE
+# =====================
+PATH_DIGITS = 10
+
+
+def content_path_segment(pk):
+    # Lebar tetap: urutan string path = urutan preorder pohon, sibling terurut id
+    return f"{pk:0{PATH_DIGITS}d}/"
+
+
+def subtree_filter(path):
+    """Node `path` beserta seluruh turunannya, sebagai satu range scan pada content_path_idx."""
+    # '/' < '0', jadi semua path yang diawali `path` ada di [path, path tanpa '/' + '0')
+    return Q(path__gte=path, path__lt=path[:-1] + '0')
+
+
+def refresh_content_paths(course_ids=None):
+    """
+    Bangun ulang CourseContent.path dari parent_id. Dipakai setelah bulk_create
+    (tanpa signal) dan oleh command `recount_course_stats`. Mengembalikan jumlah
+    baris yang path-nya berubah.
+    """
+    contents = CourseContent.objects.all()
+    if course_ids is not None:
+        contents = contents.filter(course_id__in=course_ids)
+    rows = {pk: (parent_id, path) for pk, parent_id, path in contents.values_list('id', 'parent_id', 'path').iterator()}
+    paths = {}
+    for pk in rows:
+        chain, node = [], pk
+        while node in rows and node not in paths and node not in chain:
+            chain.append(node)
+            node = rows[node][0]
+        prefix = paths.get(node, '')
+        for node in reversed(chain):
+            prefix = paths[node] = prefix + content_path_segment(node)
+    changed = [CourseContent(id=pk, path=path) for pk, path in paths.items() if rows[pk][1] != path]
+    with transaction.atomic():
+        CourseContent.objects.bulk_update(changed, ['path'], batch_size=1000)
+    return len(changed)
+
+
+def _parent_path(instance):
+    if instance.parent_id is None:
+        return ''
+    if CourseContent.parent.is_cached(instance) and instance.parent.path:
+        return instance.parent.path
+    path = CourseContent.objects.filter(pk=instance.parent_id).values_list('path', flat=True).first()
+    if not path:
+        # Induk dari bulk_create yang path-nya belum diisi
+        refresh_content_paths([instance.course_id])
+        path = CourseContent.objects.filter(pk=instance.parent_id).values_list('path', flat=True).first()
+    return path or ''
+
+
+@receiver(pre_save, sender=CourseContent)
+def content_path_moving(sender, instance, update_fields=None, **kwargs):
+    instance._tree_moved_from = None
+    if instance._state.adding or (update_fields is not None and not {'parent', 'parent_id'} & update_fields):
+        return
+    # Induk dan path lama selalu dibaca dari database: instance yang dimuat lebih awal
+    # bisa membawa nilai basi bila node ini atau leluhurnya sempat dipindah
+    stored = CourseContent.objects.filter(pk=instance.pk).values_list('parent_id', 'path').first()
+    if stored is None or stored[0] == instance.parent_id:
+        return
+    old_path = stored[1]
+    parent_path = _parent_path(instance)
+    if old_path and parent_path.startswith(old_path):
+        raise ValueError("Konten tidak bisa dipindah ke dalam dirinya sendiri atau turunannya.")
+    instance.path = parent_path + content_path_segment(instance.pk)
+    instance._tree_moved_from = old_path
+
+
+@receiver(post_save, sender=CourseContent)
+def content_path_saved(sender, instance, created, **kwargs):
+    if created:
+        instance.path = _parent_path(instance) + content_path_segment(instance.pk)
+        CourseContent.objects.filter(pk=instance.pk).update(path=instance.path)
+    elif instance._tree_moved_from:
+        # Satu UPDATE untuk seluruh subtree: awalan path lama diganti awalan baru
+        old_path = instance._tree_moved_from
+        CourseContent.objects.filter(subtree_filter(old_path), course_id=instance.course_id).update(
+            path=Concat(Value(instance.path), Substr('path', len(old_path) + 1), output_field=models.CharField()))
+    elif instance._tree_moved_from == '':
+        refresh_content_paths([instance.course_id])
+    instance._tree_moved_from = None
+
+
+# =====================
+# CERTIFICATE SNAPSHOT
+# =====================
+
+def _render_snapshot(completion_id):
+    with use_primary():
+        render_snapshots([completion_id])
+
+
+@receiver(post_save, sender=CourseCompletion)
+def certificate_completion_created(sender, instance, created, **kwargs):
+    # Dirender sekali setelah commit; bila gagal, view merender saat pertama dibuka
+    if created:
+        transaction.on_commit(lambda: _render_snapshot(instance.id), robust=True)
+
+
+@receiver(post_delete, sender=CourseCompletion)
+def certificate_completion_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: delete_snapshot(instance.id))
+
+
+# =====================
+# SEARCH INDEX
+# =====================
+
+@receiver(post_migrate)
+def repair_search_index(sender, using, **kwargs):
+    # Migrasi SQLite yang membangun ulang tabel course/konten ikut menghapus trigger FTS
+    if sender.name == 'lms_core':
+        ensure_search_index(connections[using], create=False)
@@ -0,0 +1,168 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from django.db.models import Q
+from ninja import Field, Schema
+from ninja.conf import settings
+from ninja.errors import HttpError
+from ninja.pagination import AsyncPaginationBase
+
+
+# =====================
+# CURSOR
+# =====================
+
+def encode_value(value):
+    # Format tetap (selalu dengan mikrodetik) supaya string bisa dibandingkan langsung
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="microseconds")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values, reverse=False):
+    payload = {"v": [encode_value(v) for v in values]}
+    if reverse:
+        payload["r"] = 1
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return list(payload["v"]), bool(payload.get("r"))
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HttpError(400, "Cursor tidak valid")
+
+
+def keyset_filter(ordering: Sequence[str], values: Sequence[Any], reverse=False):
+    """
+    Q untuk baris setelah `values` menurut `ordering`,
+    mis. ('-created_at', '-id') -> created_at < v0 OR (created_at = v0 AND id < v1).
+
+    Batas kolom pertama (created_at <= v0) ditambahkan terpisah walau redundan:
+    planner tidak bisa memakai OR sebagai batas range index, jadi tanpa itu
+    halaman jauh tetap memindai index dari awal.
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        descending = field.startswith("-") != reverse
+        lookup = "lt" if descending else "gt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    if len(ordering) > 1:
+        first = ordering[0]
+        lookup = "lte" if first.startswith("-") != reverse else "gte"
+        condition = Q(**{f"{first.lstrip('-')}__{lookup}": values[0]}) & condition
+    return condition
+
+
+def reverse_ordering(ordering: Sequence[str]):
+    return [f[1:] if f.startswith("-") else f"-{f}" for f in ordering]
+
+
+def field_value(row, field):
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def is_after(row, ordering: Sequence[str], values: Sequence[Any], reverse=False):
+    """Versi Python dari keyset_filter, untuk list yang sudah ada di memori."""
+    for field, value in zip(ordering, values):
+        mine = encode_value(field_value(row, field.lstrip("-")))
+        if mine == value:
+            continue
+        descending = field.startswith("-") != reverse
+        return mine < value if descending else mine > value
+    return False
+
+
+# =====================
+# NINJA PAGINATOR
+# =====================
+
+class CursorPagination(AsyncPaginationBase):
+    """
+    Keyset pagination: tiap halaman adalah range scan pada index `ordering`,
+    sehingga biaya query tidak bertambah walau halaman makin jauh.
+
+    View juga boleh mengembalikan list (mis. dari cache) yang sudah terurut
+    sesuai `ordering`; halaman lalu dipotong di memori dengan cursor yang sama.
+
+    Polling: `since_cursor` menunjuk baris pertama halaman. Klien mengirimnya
+    kembali sebagai `since` untuk mengambil hanya baris yang lebih baru (yang
+    mendahului dalam `ordering`); tanpa baris baru, token yang sama dikembalikan.
+    """
+
+    class Input(Schema):
+        cursor: Optional[str] = None
+        since: Optional[str] = None
+        limit: int = Field(settings.PAGINATION_PER_PAGE, ge=1, le=settings.PAGINATION_MAX_LIMIT)
+
+    class Output(Schema):
+        items: List[Any]
+        next_cursor: Optional[str] = None
+        prev_cursor: Optional[str] = None
+        since_cursor: Optional[str] = None
+
+    def __init__(self, ordering: Sequence[str] = ("-created_at", "-id"), **kwargs):
+        self.ordering = list(ordering)
+        super().__init__(**kwargs)
+
+    def _page_query(self, queryset, pagination: Input):
+        limit = min(pagination.limit, settings.PAGINATION_MAX_LIMIT)
+        values, reverse = None, False
+        if pagination.cursor and pagination.since:
+            raise HttpError(400, "cursor dan since tidak bisa dipakai bersamaan")
+        if pagination.cursor or pagination.since:
+            values, reverse = decode_cursor(pagination.cursor or pagination.since)
+            # `since` selalu ke arah baris yang lebih baru
+            reverse = reverse or bool(pagination.since)
+            if len(values) != len(self.ordering):
+                raise HttpError(400, "Cursor tidak valid")
+        if isinstance(queryset, list):
+            rows = queryset[::-1] if reverse else queryset
+            if values is not None:
+                rows = [r for r in rows if is_after(r, self.ordering, values, reverse)]
+            return rows[:limit + 1], limit, reverse
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(self.ordering, values, reverse))
+        ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+        return queryset.order_by(*ordering)[:limit + 1], limit, reverse
+
+    def _build_page(self, rows: list, limit: int, reverse: bool, pagination: Input):
+        has_cursor = bool(pagination.cursor or pagination.since)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if reverse:
+            rows.reverse()
+        has_next = has_more if not reverse else True
+        has_prev = has_more if reverse else has_cursor
+        fields = [f.lstrip("-") for f in self.ordering]
+        next_cursor = prev_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor([field_value(rows[-1], f) for f in fields])
+        if rows and has_prev:
+            prev_cursor = encode_cursor([field_value(rows[0], f) for f in fields], reverse=True)
+        since_cursor = pagination.since
+        if rows and (reverse or not pagination.cursor):
+            # Halaman pertama atau halaman ke arah baris baru: baris pertamanya yang paling baru,
+            # polling berikutnya mulai dari situ (sisa baris baru terambil per `limit`)
+            since_cursor = encode_cursor([field_value(rows[0], f) for f in fields], reverse=True)
+        return {"items": rows, "next_cursor": next_cursor, "prev_cursor": prev_cursor, "since_cursor": since_cursor}
+
+    def paginate_queryset(self, queryset, pagination: Input, **params):
+        page, limit, reverse = self._page_query(queryset, pagination)
+        return self._build_page(list(page), limit, reverse, pagination)
+
+    async def apaginate_queryset(self, queryset, pagination: Input, **params):
+        page, limit, reverse = self._page_query(queryset, pagination)
+        rows = page if isinstance(page, list) else [row async for row in page]
+        return self._build_page(rows, limit, reverse, pagination)
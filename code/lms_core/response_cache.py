@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from ninja.utils import contribute_operation_callback
+
+TAG_PREFIX = "response-tag:"
+ENTRY_PREFIX = "response:"
+
+
+# =====================
+# BACKEND
+# =====================
+
+def response_cache():
+    # locmem saat development/test, Redis di production (lihat CACHES di settings)
+    return caches[settings.LMS_RESPONSE_CACHE_ALIAS]
+
+
+def request_role(request):
+    if not request.user.is_authenticated:
+        return "anon"
+    return "staff" if request.user.is_staff else "user"
+
+
+def response_cache_key(request):
+    # Path + query string + role: hasil route bisa berbeda untuk staff (mis. konten terjadwal)
+    raw = f"{request.method}:{request.get_full_path()}:{request_role(request)}"
+    return ENTRY_PREFIX + hashlib.sha1(raw.encode()).hexdigest()
+
+
+# =====================
+# TAG
+# =====================
+
+def _tag_key(tag):
+    return f"{TAG_PREFIX}{tag}"
+
+
+def invalidate_tags(*tags):
+    """
+    Semua response yang membawa salah satu `tags` dianggap basi. Tiap tag punya
+    versi; entry menyimpan versi saat ditulis, jadi tidak perlu mencari key.
+    Dijalankan setelah commit supaya request lain tidak mengisi cache dengan
+    data lama sebelum transaksi selesai.
+    """
+    def bump():
+        version = time.time_ns()
+        response_cache().set_many({_tag_key(tag): version for tag in tags}, None)
+    transaction.on_commit(bump)
+
+
+def _current_versions(backend, tags, entry_key=None):
+    keys = [_tag_key(tag) for tag in tags]
+    found = backend.get_many(keys + ([entry_key] if entry_key else []))
+    versions = {key: found[key] for key in keys if key in found}
+    return versions, found.get(entry_key)
+
+
+async def _acurrent_versions(backend, tags, entry_key):
+    keys = [_tag_key(tag) for tag in tags]
+    found = await backend.aget_many(keys + [entry_key])
+    versions = {key: found[key] for key in keys if key in found}
+    return versions, found.get(entry_key)
+
+
+def _is_fresh(entry, versions, tags):
+    return entry is not None and len(versions) == len(tags) and entry["versions"] == versions
+
+
+def _cached_response(request, entry):
+    validators = entry.get("etag"), entry.get("last_modified")
+    not_modified = _not_modified(request, *validators)
+    if not_modified:
+        return not_modified
+    response = HttpResponse(entry["body"], content_type=entry["content_type"])
+    if validators[0]:
+        _set_validators(response, *validators)
+    return response
+
+
+def _entry_to_store(request, response, tags, versions, timeout):
+    """
+    (versi tag baru, entry, ttl) untuk disimpan, atau None bila response tidak
+    boleh di-cache. `versions` dilengkapi dengan versi tag yang belum ada.
+    """
+    if response.status_code != 200:
+        return None
+    # Tag baru saja diinvalidasi: replica baca mungkin masih tertinggal, body jangan disimpan
+    lag_ns = settings.LMS_DB_REPLICA_LAG * 10**9
+    if settings.LMS_DB_REPLICAS and versions and max(versions.values()) > time.time_ns() - lag_ns:
+        return None
+    missing = {_tag_key(tag): time.time_ns() for tag in tags if _tag_key(tag) not in versions}
+    versions.update(missing)
+    ttl = getattr(request, "response_cache_timeout", None) or timeout or settings.LMS_RESPONSE_CACHE_TIMEOUT
+    entry = {
+        "versions": versions,
+        "content_type": response["Content-Type"],
+        "body": response.content,
+    }
+    return missing, entry, ttl
+
+
+# =====================
+# CONDITIONAL GET
+# =====================
+
+VALIDATOR_AGGREGATES = {"last_modified": Max("updated_at"), "count": Count("pk")}
+
+
+def _validators(request, aggregate, versions):
+    """
+    (ETag kuat, Last-Modified epoch) dari max(updated_at) dan jumlah baris
+    queryset validator. Versi tag ikut dihitung: hapus baris atau perubahan
+    data relasi (mis. nama course) yang tidak menyentuh updated_at tetap
+    menghasilkan ETag baru.
+    """
+    latest = aggregate["last_modified"]
+    raw = f"{latest and latest.isoformat()}:{aggregate['count']}:{request_role(request)}:{sorted(versions.items())}"
+    stamps = [latest.timestamp()] if latest else []
+    stamps += [version / 10**9 for version in versions.values()]
+    return f'"{hashlib.sha1(raw.encode()).hexdigest()}"', int(max(stamps)) if stamps else None
+
+
+def _set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    # Klien wajib revalidasi tiap kali; isi berbeda per role sehingga hanya cache privat
+    response["Cache-Control"] = "private, no-cache"
+
+
+def _not_modified(request, etag, last_modified):
+    """Response 304 bila If-None-Match/If-Modified-Since request masih cocok, selain itu None."""
+    if not etag or request.method not in ("GET", "HEAD"):
+        return None
+    headers = HttpResponse()
+    _set_validators(headers, etag, last_modified)
+    response = get_conditional_response(request, etag, last_modified, headers)
+    return response if response.status_code == 304 else None
+
+
+def _attach_validators(request, response, aggregate, versions, store):
+    # Dihitung setelah _entry_to_store supaya versi tag yang baru dibuat ikut masuk ETag
+    if aggregate is None or response.status_code != 200:
+        return
+    etag, last_modified = _validators(request, aggregate, versions)
+    _set_validators(response, etag, last_modified)
+    if store:
+        store[1].update(etag=etag, last_modified=last_modified)
+
+
+# =====================
+# DECORATOR
+# =====================
+
+def cache_response(*tags, timeout=None, validator=None):
+    """
+    Cache body JSON response GET yang sukses (200).
+
+    `tags` boleh memakai parameter path, mis. "course:{course_id}". View dapat
+    memperpendek umur entry lewat `request.response_cache_timeout`.
+    Pasang di bawah @apiv1.get dan di atas @paginate. View `async def` ikut
+    didukung lewat API cache async (aget_many/aset).
+
+    `validator(request, **kwargs)` (argumen yang sama dengan view) mengembalikan queryset sumber response.
+    Bila diisi, response membawa ETag dan Last-Modified, dan request bersyarat
+    yang masih cocok dijawab 304 tanpa menjalankan view: dari entry cache tanpa
+    query sama sekali, atau dengan satu query agregat bila entry belum ada.
+    """
+    def decorator(view_func):
+        operation = {}
+
+        def render(request, result):
+            op = operation["op"]
+            return op._result_to_response(request, result, op.api.create_temporal_response(request))
+
+        if asyncio.iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def wrapper(request, *args, **kwargs):
+                backend = response_cache()
+                entry_tags = [tag.format(**kwargs) for tag in tags]
+                key = response_cache_key(request)
+                versions, entry = await _acurrent_versions(backend, entry_tags, key)
+                if _is_fresh(entry, versions, entry_tags):
+                    return _cached_response(request, entry)
+
+                aggregate = None
+                if validator:
+                    aggregate = await validator(request, **kwargs).aaggregate(**VALIDATOR_AGGREGATES)
+                    not_modified = _not_modified(request, *_validators(request, aggregate, versions))
+                    if not_modified:
+                        return not_modified
+                response = render(request, await view_func(request, *args, **kwargs))
+                store = _entry_to_store(request, response, entry_tags, versions, timeout)
+                _attach_validators(request, response, aggregate, versions, store)
+                if store:
+                    missing, entry, ttl = store
+                    if missing:
+                        await backend.aset_many(missing, None)
+                    await backend.aset(key, entry, ttl)
+                return response
+        else:
+            @wraps(view_func)
+            def wrapper(request, *args, **kwargs):
+                backend = response_cache()
+                entry_tags = [tag.format(**kwargs) for tag in tags]
+                key = response_cache_key(request)
+                versions, entry = _current_versions(backend, entry_tags, key)
+                if _is_fresh(entry, versions, entry_tags):
+                    return _cached_response(request, entry)
+
+                aggregate = None
+                if validator:
+                    aggregate = validator(request, **kwargs).aggregate(**VALIDATOR_AGGREGATES)
+                    not_modified = _not_modified(request, *_validators(request, aggregate, versions))
+                    if not_modified:
+                        return not_modified
+                response = render(request, view_func(request, *args, **kwargs))
+                store = _entry_to_store(request, response, entry_tags, versions, timeout)
+                _attach_validators(request, response, aggregate, versions, store)
+                if store:
+                    missing, entry, ttl = store
+                    if missing:
+                        backend.set_many(missing, None)
+                    backend.set(key, entry, ttl)
+                return response
+
+        def remember_operation(op):
+            operation["op"] = op
+
+        # Salinan list supaya callback tidak ikut terpasang di view asli
+        wrapper._ninja_contribute_to_operation = list(getattr(view_func, "_ninja_contribute_to_operation", []))
+        contribute_operation_callback(wrapper, remember_operation)
+        return wrapper
+
+    return decorator
@@ -24,6 +24,9 @@ class LoginIn(Schema):
     username: str
     password: str
 
+class RefreshIn(Schema):
+    refresh: str
+
 # =====================
 # COURSE
 # =====================
@@ -47,12 +50,27 @@ class CourseSchemaOut(Schema):
     created_at: datetime
     updated_at: datetime
 
+class CourseSummaryOut(Schema):
+    # Tanpa description: dipakai saat course di-nest di dalam list lain
+    id: int
+    name: str
+    price: int
+    image: Optional[str]
+    teacher_id: int
+    max_students: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+
+class CourseListOut(CourseSummaryOut):
+    teacher: UserOut
+    excerpt: Optional[str] = None
+
 # =====================
 # COURSE MEMBER
 # =====================
 class CourseMemberOut(Schema):
     id: int 
-    course: CourseSchemaOut
+    course: CourseSummaryOut
     user: UserOut
     roles: str
 
@@ -63,7 +81,7 @@ class CourseContentMini(Schema):
     id: int
     name: str
     description: str
-    course: CourseSchemaOut
+    course: CourseSummaryOut
     release_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     created_at: datetime
@@ -75,12 +93,19 @@ class CourseContentFull(Schema):
     description: str
     video_url: Optional[str]
     file_attachment: Optional[str]
-    course: CourseSchemaOut
+    course: CourseSummaryOut
     release_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
+class ContentOutlineOut(Schema):
+    id: int
+    name: str
+    release_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    children: List["ContentOutlineOut"] = []
+
 class CourseContentIn(Schema):
     name: str
     description: Optional[str] = '-'
@@ -108,12 +133,27 @@ class CourseCommentIn(Schema):
 class CourseCommentModerationIn(Schema):
     is_moderated: bool
 
+class CommentBulkModerationIn(Schema):
+    comment_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    is_moderated: bool = True
+
+class CommentBulkModerationOut(Schema):
+    message: str
+    moderated: List[int]
+    skipped: List[int]
+
 # =====================
 # BATCH ENROLL
 # =====================
 class BatchEnrollIn(Schema):
     user_ids: List[int]
 
+class BatchEnrollOut(Schema):
+    message: str
+    enrolled: List[int]
+    skipped: List[int]
+    rejected: List[int]
+
 # =====================
 # COMPLETION
 # =====================
@@ -128,6 +168,17 @@ class CourseContentCompletionOut(Schema):
 
     model_config = ConfigDict(from_attributes=True)
 
+class CourseProgressOut(Schema):
+    user_id: int
+    course_id: int
+    completed_contents: int
+    total_contents: int
+    percentage: float
+    is_completed: bool
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
 class CourseCompletionIn(Schema):
     course_id: int = Field(..., description="ID of the course being marked as completed.")
 
@@ -162,7 +213,7 @@ class BookmarkIn(Schema):
 class BookmarkOut(Schema):
     id: int
     content: CourseContentFull
-    course: CourseSchemaOut
+    course: CourseSummaryOut
     created_at: datetime
 
 # =====================
@@ -176,8 +227,28 @@ class FeedbackIn(Schema):
 class FeedbackOut(Schema):
     id: int
     user: UserOut
-    course: CourseSchemaOut
+    course: CourseSummaryOut
     rating: int
     comment: str
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+# =====================
+# SEARCH
+# =====================
+class SearchIn(Schema):
+    q: str = Field(min_length=1, max_length=200)
+    limit: int = Field(20, ge=1, le=100)
+    # Halaman dalam hasil berperingkat dibatasi; biaya naik seiring offset
+    offset: int = Field(0, ge=0, le=1000)
+
+class SearchHitOut(Schema):
+    kind: str
+    id: int
+    course_id: int
+    name: str
+    snippet: str
+    score: float
+
+class SearchPageOut(Schema):
+    items: List[SearchHitOut]
+    next_offset: Optional[int] = None
@@ -0,0 +1,214 @@
+import html
+import re
+
+from django.apps import apps
+from django.db import connections, router
+
+SNIPPET_WORDS = 16
+
+# (jenis hasil, tabel sumber, bobot kolom name) — name lebih menentukan daripada description
+SOURCES = [
+    ("course", "lms_core_course", 10.0),
+    ("content", "lms_core_coursecontent", 10.0),
+]
+
+
+# =====================
+# QUERY
+# =====================
+
+def search_terms(q):
+    """Kata dari input bebas; tanda baca dan operator FTS diabaikan supaya tidak bisa disuntikkan."""
+    return re.findall(r"\w+", q.lower())[:10]
+
+
+def _fts5_match(terms):
+    # Semua kata wajib ada; kata terakhir juga cocok sebagai awalan (search-as-you-type)
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _tsquery(terms):
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+
+# =====================
+# INDEX
+# =====================
+
+def _sqlite_index_sql(table):
+    fts = f"{table}_fts"
+    cols = "name, description"
+    new = "new.id, new.name, new.description"
+    old = "'delete', old.id, old.name, old.description"
+    return fts, [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES ({new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ({old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF name, description ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ({old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES ({new}); END",
+    ]
+
+
+def ensure_search_index(conn, create=True):
+    """
+    Pasang index full-text bila belum ada, lalu isi ulang dari tabel sumber.
+    Dengan create=False hanya memperbaiki index SQLite yang tabel FTS-nya sudah ada.
+
+    SQLite: tabel FTS5 external-content + trigger insert/update/delete, jadi
+    bulk_create dan update() ikut ter-index. Migrasi SQLite yang membangun ulang
+    tabel menghapus trigger; karena itu fungsi ini juga dipanggil setelah setiap
+    migrate (lihat models.py) dan hanya membangun ulang index yang rusak.
+
+    Postgres: kolom `search_vector` tsvector GENERATED + index GIN, selalu sinkron.
+    Mengembalikan daftar tabel yang index-nya dibangun ulang.
+    """
+    rebuilt = []
+    with conn.cursor() as cursor:
+        for _, table, _ in SOURCES:
+            if conn.vendor == "sqlite":
+                fts, statements = _sqlite_index_sql(table)
+                cursor.execute("SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+                               [f"{fts}_ai", f"{fts}_ad", f"{fts}_au"])
+                if cursor.fetchone()[0] == 3:
+                    continue
+                cursor.execute("SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = %s", [fts])
+                if not create and not cursor.fetchone()[0]:
+                    continue
+                for sql in statements:
+                    cursor.execute(sql)
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                rebuilt.append(table)
+            elif conn.vendor == "postgresql" and create:
+                cursor.execute(
+                    f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+                    f"setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+                    f"setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED"
+                )
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_search_idx ON {table} USING gin (search_vector)")
+    return rebuilt
+
+
+def drop_search_index(conn):
+    with conn.cursor() as cursor:
+        for _, table, _ in SOURCES:
+            if conn.vendor == "sqlite":
+                fts = f"{table}_fts"
+                for suffix in ("ai", "ad", "au"):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+                cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+            elif conn.vendor == "postgresql":
+                cursor.execute(f"DROP INDEX IF EXISTS {table}_search_idx")
+                cursor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+
+
+# =====================
+# SEARCH
+# =====================
+
+def _visible_content_sql(kind, now, include_hidden):
+    # Sama dengan visible_at() di api.py: konten terjadwal/berakhir hanya terlihat oleh staff
+    if kind != "content" or include_hidden:
+        return "", []
+    return " AND (s.release_date IS NULL OR s.release_date <= %s) AND (s.end_date IS NULL OR s.end_date >= %s)", \
+        [now, now]
+
+
+def _page_sqlite(cursor, sources, match, window, now, include_hidden):
+    # Tiap sumber diranking terpisah dan dipotong di `window` baris teratas; gabungannya
+    # diurutkan ulang. Snippet hanya dihitung untuk baris yang masuk halaman.
+    parts, params = [], []
+    for kind, table, weight in sources:
+        fts = f"{table}_fts"
+        course_col = "s.id" if kind == "course" else "s.course_id"
+        where, extra = _visible_content_sql(kind, now, include_hidden)
+        parts.append(
+            f"SELECT * FROM (SELECT '{kind}' AS kind, s.id AS id, {course_col} AS course_id, s.name AS name, "
+            f"bm25({fts}, {weight}, 1.0) AS score FROM {fts} JOIN {table} s ON s.id = {fts}.rowid "
+            f"WHERE {fts} MATCH %s{where} ORDER BY score, s.id LIMIT %s)"
+        )
+        params += [match, *extra, window]
+    cursor.execute(" UNION ALL ".join(parts) + " ORDER BY score, kind, id", params)
+    return [dict(zip(("kind", "id", "course_id", "name", "score"), row)) for row in cursor.fetchall()]
+
+
+def _page_postgres(cursor, sources, tsquery, window, now, include_hidden):
+    parts, params = [], []
+    for kind, table, _ in sources:
+        course_col = "s.id" if kind == "course" else "s.course_id"
+        where, extra = _visible_content_sql(kind, now, include_hidden)
+        parts.append(
+            f"(SELECT '{kind}' AS kind, s.id AS id, {course_col} AS course_id, s.name AS name, "
+            f"-ts_rank(s.search_vector, q) AS score FROM {table} s, to_tsquery('simple', %s) q "
+            f"WHERE s.search_vector @@ q{where} ORDER BY score, s.id LIMIT %s)"
+        )
+        params += [tsquery, *extra, window]
+    cursor.execute(" UNION ALL ".join(parts) + " ORDER BY score, kind, id", params)
+    return [dict(zip(("kind", "id", "course_id", "name", "score"), row)) for row in cursor.fetchall()]
+
+
+def highlight(text, terms, words=SNIPPET_WORDS):
+    """
+    Potongan `text` sekitar kemunculan pertama `terms`, di-escape HTML dengan kata
+    yang cocok dibungkus <mark>. Kata terakhir dicocokkan sebagai awalan, sama
+    dengan query index. Hanya dijalankan untuk baris di halaman hasil.
+    """
+    tokens = list(re.finditer(r"\w+", text))
+    exact, prefix = set(terms[:-1]), terms[-1]
+
+    def matches(token):
+        word = token.group().lower()
+        return word in exact or word.startswith(prefix)
+
+    first = next((i for i, token in enumerate(tokens) if matches(token)), 0)
+    start = max(0, first - words // 4)
+    window = tokens[start:start + words]
+    if not window:
+        return ""
+    parts = ["…"] if start else []
+    position = window[0].start()
+    for token in window:
+        parts.append(html.escape(text[position:token.start()]))
+        word = html.escape(token.group())
+        parts.append(f"<mark>{word}</mark>" if matches(token) else word)
+        position = token.end()
+    if start + words < len(tokens):
+        parts.append("…")
+    return "".join(parts)
+
+
+def search(q, now, limit=20, offset=0, include_hidden=False, kinds=None, snippets=True):
+    """
+    Course dan konten yang cocok dengan `q`, terurut relevansi (`score` makin besar
+    makin relevan). `kinds` membatasi jenis hasil ("course", "content").
+    Mengembalikan (hasil halaman ini, ada halaman berikutnya).
+    """
+    terms = search_terms(q)
+    if not terms:
+        return [], False
+    sources = [source for source in SOURCES if kinds is None or source[0] in kinds]
+    window = offset + limit + 1
+    conn = connections[router.db_for_read(apps.get_model("lms_core", "Course"))]
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql":
+            rows = _page_postgres(cursor, sources, _tsquery(terms), window, now, include_hidden)
+        else:
+            rows = _page_sqlite(cursor, sources, _fts5_match(terms), window, now, include_hidden)
+    page = rows[offset:offset + limit]
+    descriptions = {}
+    if snippets:
+        # Snippet dari deskripsi baris di halaman saja (ambil per PK), bukan dari seluruh hasil MATCH
+        for kind, model in (("course", "Course"), ("content", "CourseContent")):
+            ids = [row["id"] for row in page if row["kind"] == kind]
+            if ids:
+                found = apps.get_model("lms_core", model).objects.filter(id__in=ids).values_list("id", "description")
+                descriptions.update({(kind, pk): text for pk, text in found})
+    for row in page:
+        row["snippet"] = highlight(descriptions.get((row["kind"], row["id"]), ""), terms)
+        row["score"] = round(-row["score"], 4)
+    return page, len(rows) > offset + limit
@@ -0,0 +1,117 @@
+import threading
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+# =====================
+# PROFIL KONEKSI
+# =====================
+
+def profile_options(pragmas):
+    """
+    OPTIONS database SQLite untuk profil konkuren: PRAGMA dijalankan tiap koneksi
+    dibuka, transaksi tulis langsung memegang lock (IMMEDIATE) sehingga tidak ada
+    upgrade lock yang gagal di tengah transaksi.
+    """
+    return {
+        "init_command": ";".join(f"PRAGMA {name}={value}" for name, value in pragmas.items()),
+        "transaction_mode": "IMMEDIATE",
+        "timeout": pragmas.get("busy_timeout", 5000) / 1000,
+    }
+
+
+# =====================
+# ANTRIAN TULIS
+# =====================
+
+class WriteQueue:
+    """
+    Antrian FIFO satu penulis per proses. SQLite hanya mengizinkan satu penulis;
+    dengan mengantre di sini, thread lain tidak berebut lock file dan tidak
+    jatuh ke polling busy_timeout. Tiket yang dilepas sebelum gilirannya (request
+    async yang dibatalkan) dilewati.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._abandoned = set()
+
+    def take(self):
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            return ticket
+
+    def wait(self, ticket):
+        with self._cond:
+            while self._serving < ticket:
+                self._cond.wait()
+
+    def release(self, ticket):
+        with self._cond:
+            if ticket != self._serving:
+                self._abandoned.add(ticket)
+                return
+            self._serving += 1
+            while self._serving in self._abandoned:
+                self._abandoned.discard(self._serving)
+                self._serving += 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def turn(self):
+        ticket = self.take()
+        try:
+            self.wait(ticket)
+            yield
+        finally:
+            self.release(ticket)
+
+
+write_queue = WriteQueue()
+
+
+class WriteQueueMiddleware:
+    """
+    Request non-GET dijalankan bergiliran lewat write_queue (aktif bila LMS_SQLITE_WRITE_QUEUE).
+    Di ASGI request baca langsung diteruskan ke handler async; request tulis menunggu
+    gilirannya di thread pool, tidak memblokir event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.LMS_SQLITE_WRITE_QUEUE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _exempt(self, request):
+        return request.method in SAFE_METHODS or request.path.startswith(tuple(settings.LMS_SQLITE_WRITE_QUEUE_EXEMPT))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self._exempt(request):
+            return self.get_response(request)
+        with write_queue.turn():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self._exempt(request):
+            return await self.get_response(request)
+        ticket = write_queue.take()
+        try:
+            await sync_to_async(write_queue.wait, thread_sensitive=False)(ticket)
+            return await self.get_response(request)
+        finally:
+            write_queue.release(ticket)
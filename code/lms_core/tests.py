@@ -0,0 +1,43 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from lms_core.models import Comment, Course, CourseContent, CourseMember
+from lms_core.response_cache import response_cache
+
+
+class ContentCommentsQueryTest(TestCase):
+    """GET komentar konten: jumlah query tetap, tidak tumbuh per komentar (N+1)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user("guru", "guru@example.com", "rahasia")
+        cls.course = Course.objects.create(name="Kursus", description="-", price=0, teacher=cls.teacher)
+        cls.contents = [
+            CourseContent.objects.create(course=cls.course, name=f"Konten {i}") for i in range(2)
+        ]
+        students = User.objects.bulk_create([User(username=f"siswa{i}") for i in range(5)])
+        members = CourseMember.objects.bulk_create([CourseMember(course=cls.course, user=u) for u in students])
+        # Konten pertama 3 komentar, konten kedua 30: jumlah query harus sama
+        Comment.objects.bulk_create([
+            Comment(content=content, course=cls.course, member=members[i % len(members)],
+                    comment=f"Komentar {i}", is_moderated=True)
+            for content, count in zip(cls.contents, (3, 30)) for i in range(count)
+        ])
+
+    def setUp(self):
+        response_cache().clear()
+        self.client.force_login(self.teacher)
+
+    def get_comments(self, content):
+        return self.client.get(f"/api/v1/courses/{self.course.id}/contents/{content.id}/comments",
+                               {"limit": 50})
+
+    def test_query_count_does_not_grow_with_comments(self):
+        # session, user, konten, satu halaman komentar beserta relasinya (JOIN)
+        for content, count in zip(self.contents, (3, 30)):
+            with self.assertNumQueries(4):
+                response = self.get_comments(content)
+            self.assertEqual(response.status_code, 200)
+            items = response.json()["items"]
+            self.assertEqual(len(items), count)
+            self.assertEqual(items[0]["member"]["user"]["username"][:5], "siswa")
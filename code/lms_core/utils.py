@@ -1,24 +1,10 @@
 from django.contrib.auth.hashers import check_password
 from django.utils import timezone
-from django.conf import settings
-from datetime import timedelta
-import jwt  
 
 # Validasi password biasa vs hashed
 def validate_password(plain_password, hashed_password):
     return check_password(plain_password, hashed_password)
 
-# Fungsi untuk membuat JWT token (login)
-def create_jwt_token(user):
-    payload = {
-        'user_id': user.id,
-        'username': user.username,
-        'exp': timezone.now() + timedelta(days=1),  # expire 1 hari
-        'iat': timezone.now()
-    }
-    token = jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
-    return token
-
 # Fungsi waktu saat ini dengan awareness timezone
 def get_current_timestamp():
     return timezone.now()
@@ -1,9 +1,11 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
 from .models import (
-    Course, CourseMember, CourseContent, Comment,
-    CourseContentCompletion, CourseCompletion, CourseAnnouncement
+    Course, CourseContent, Comment,
+    CourseContentCompletion, CourseCompletion, CourseAnnouncement, get_user_activity, moderate_comments
 )
+from .certificates import SNAPSHOT_CACHE_CONTROL, ensure_snapshot, snapshot_etag
 from django.contrib.auth.models import User
 from django.db.models import Count
 from datetime import datetime
@@ -32,44 +34,30 @@ def deleteData(request):
 # Fitur: Sertifikat Penyelesaian Kursus
 
 def render_certificate(request, completion_id: int):
-    course_completion = get_object_or_404(CourseCompletion, id=completion_id)
+    # Cukup pemilik completion untuk cek akses; HTML diambil dari snapshot (lihat certificates.py)
+    course_completion = get_object_or_404(CourseCompletion.objects.only('id', 'user_id'), id=completion_id)
 
-    if not request.user.is_authenticated or (request.user != course_completion.user and not request.user.is_staff):
+    if not request.user.is_authenticated or (request.user.id != course_completion.user_id and not request.user.is_staff):
         return HttpResponse("Tidak diizinkan untuk melihat sertifikat ini.", status=403)
 
-    user = course_completion.user
-    course = course_completion.course
-    is_course_completed = True
-    completion_date = course_completion.completion_date
-
-    total_contents_in_course = CourseContent.objects.filter(course=course).count()
-    completed_contents_by_user = CourseContentCompletion.objects.filter(
-        user=user,
-        content__course=course
-    ).count()
-
-    context = {
-        'user': user,
-        'course': course,
-        'completion_date': completion_date,
-        'certificate_id': course_completion.id,
-        'is_course_completed': is_course_completed,
-        'total_contents': total_contents_in_course,
-        'completed_contents': completed_contents_by_user,
-    }
-    return render(request, 'certificate.html', context)
+    path = ensure_snapshot(course_completion.id)
+    headers = {'ETag': snapshot_etag(path), 'Cache-Control': SNAPSHOT_CACHE_CONTROL}
+    not_modified = get_conditional_response(request, etag=headers['ETag'], response=HttpResponse(headers=headers))
+    if not_modified.status_code == 304:
+        return not_modified
+    return FileResponse(open(path, 'rb'), content_type='text/html; charset=utf-8', headers=headers)
 
 # Fitur: Statistik Aktivitas Pengguna
 
 @login_required
 def user_activity_stats(request):
-    user = request.user
+    activity = get_user_activity(request.user.id)
 
     data = {
-        "courses_as_student": CourseMember.objects.filter(user=user).count(),
-        "courses_created": Course.objects.filter(teacher=user).count(),
-        "comments_written": Comment.objects.filter(member__user=user).count(),
-        "contents_completed": CourseContentCompletion.objects.filter(user=user).count(),
+        "courses_as_student": activity["courses_joined"],
+        "courses_created": activity["courses_created_as_teacher"],
+        "comments_written": activity["comments_written"],
+        "contents_completed": activity["content_completed"],
     }
 
     return JsonResponse(data)
@@ -93,8 +81,7 @@ def moderate_comment(request, comment_id):
 
     try:
         data = json.loads(request.body)
-        comment.is_moderated = data.get("is_moderated", True)
-        comment.save()
+        moderate_comments([comment.id], bool(data.get("is_moderated", True)))
         return JsonResponse({"message": "Komentar berhasil dimoderasi."})
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
@@ -104,7 +91,7 @@ def moderate_comment(request, comment_id):
 
 @login_required
 def get_moderated_comments(request, content_id):
-    comments = Comment.objects.filter(content_id=content_id, is_moderated=True)
+    comments = Comment.objects.filter(content_id=content_id, is_moderated=True).select_related('member__user')
     data = [
         {
             "id": c.id,
@@ -245,7 +232,8 @@ def delete_completion(request, completion_id):
         return JsonResponse({"error": "Invalid method"}, status=405)
 
     try:
-        completion = CourseContentCompletion.objects.get(pk=completion_id, user=request.user)
+        # content ikut diambil: signal progres butuh course_id konten
+        completion = CourseContentCompletion.objects.select_related('content').get(pk=completion_id, user=request.user)
         completion.delete()
         return JsonResponse({"message": "Completion deleted."})
     except CourseContentCompletion.DoesNotExist:
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'lms_core.db_router.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -49,6 +51,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'lms_core.sqlite.WriteQueueMiddleware',
 ]
 
 ROOT_URLCONF = 'simplelms.urls'
@@ -57,8 +60,14 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Template dikompilasi sekali per proses (mis. certificate.html yang besar)
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -82,6 +91,60 @@ DATABASES = {
     }
 }
 
+# Profil SQLite untuk beban konkuren, aktif dengan LMS_SQLITE_PROFILE=1:
+# PRAGMA di bawah dijalankan tiap koneksi, transaksi IMMEDIATE, dan request
+# tulis diantrikan per proses (lms_core.sqlite.WriteQueueMiddleware).
+LMS_SQLITE_PROFILE = os.environ.get('LMS_SQLITE_PROFILE') == '1'
+LMS_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # negatif = KiB, jadi 64 MiB
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+LMS_SQLITE_WRITE_QUEUE = LMS_SQLITE_PROFILE
+# Login/refresh hanya menulis sedikit tetapi lama di hashing password: tidak ikut antre
+LMS_SQLITE_WRITE_QUEUE_EXEMPT = ['/api/v1/auth/']
+
+if LMS_SQLITE_PROFILE:
+    from lms_core.sqlite import profile_options
+    DATABASES['default']['OPTIONS'] = profile_options(LMS_SQLITE_PRAGMAS)
+
+# Replica baca: LMS_DB_REPLICAS berisi NAME database replica dipisah koma (mis. dua file
+# SQLite lokal, disalin dari primary dengan `manage.py sync_replicas`). Baca aman diarahkan
+# ke replica, tulis ke `default`; setelah tulis, klien di-pin ke primary selama
+# LMS_DB_REPLICA_LAG detik (lms_core.db_router).
+LMS_DB_REPLICAS = []
+for _i, _name in enumerate(filter(None, os.environ.get('LMS_DB_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica{_i}'] = {**DATABASES['default'], 'NAME': _name.strip(), 'TEST': {'MIRROR': 'default'}}
+    LMS_DB_REPLICAS.append(f'replica{_i}')
+DATABASE_ROUTERS = ['lms_core.db_router.PrimaryReplicaRouter']
+LMS_DB_REPLICA_LAG = int(os.environ.get('LMS_DB_REPLICA_LAG', 5))
+LMS_DB_PIN_COOKIE = 'lms_primary_until'
+
+
+# Cache
+# Response cache API memakai alias "responses": locmem secara default (dan saat test),
+# Redis bila REDIS_URL di-set (service redis di docker-compose). Cache data yang
+# diinvalidasi lewat signal (aktivitas user, list konten) juga di alias ini agar
+# invalidasi berlaku di semua worker.
+
+REDIS_URL = os.environ.get('REDIS_URL')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -119,11 +182,44 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Snapshot HTML sertifikat, dirender sekali saat CourseCompletion dibuat
+# (backfill: `manage.py render_certificates`)
+LMS_CERTIFICATE_DIR = os.environ.get('LMS_CERTIFICATE_DIR', str(BASE_DIR / 'certificates'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Pagination API (django-ninja)
+NINJA_PAGINATION_PER_PAGE = 20
+NINJA_PAGINATION_MAX_LIMIT = 100
+
+# Panjang ringkasan description pada list course (?excerpt=true)
+LMS_COURSE_EXCERPT_LENGTH = 160
+
+# Lama (detik) ringkasan aktivitas user disimpan di cache. Entry juga dihapus
+# saat user enroll, menulis komentar, menyelesaikan konten atau membuat course.
+LMS_USER_ACTIVITY_CACHE_TIMEOUT = 300
+
+# Batas atas umur cache daftar konten yang terlihat; umur sebenarnya dipotong
+# sampai jadwal rilis/berakhir konten berikutnya.
+LMS_CONTENTS_CACHE_TIMEOUT = 3600
+
+# Auth API: "session", "token" (bearer JWT saja, tanpa session) atau "both"
+LMS_API_AUTH = os.environ.get('LMS_API_AUTH', 'both')
+
+# JWT RS256 (lms_core.auth); lama berlaku dalam detik
+LMS_JWT_PRIVATE_KEY_PATH = BASE_DIR / 'jwt-signing.pem'
+LMS_JWT_PUBLIC_KEY_PATH = BASE_DIR / 'jwt-signing.pub'
+LMS_JWT_ACCESS_TOKEN_LIFETIME = 15 * 60
+LMS_JWT_REFRESH_TOKEN_LIFETIME = 7 * 24 * 60 * 60
+LMS_JWT_LEEWAY = 10
+
+# Response cache route GET (lms_core.response_cache); entry juga dibuang lewat tag
+LMS_RESPONSE_CACHE_ALIAS = 'responses'
+LMS_RESPONSE_CACHE_TIMEOUT = 600
+
 try:
     from .local_settings import *
 except:
@@ -1,59 +1,285 @@
-from locust import HttpUser, TaskSet, task, between
+"""
+Load test apiv1 dengan persona berbobot.
+
+Siapkan data dan pool user (sekali, di database yang akan diuji):
+    cd code && python manage.py seed_load_test --scale 5
+
+Jalankan headless:
+    locust -f load_test/locust_file.py --headless -u 50 -r 10 -t 2m --host http://localhost:8000 \
+        --user-pool load_test/user_pool.json --thresholds load_test/thresholds.json \
+        --report load_test/report.json
+
+Report berisi p50/p95/p99, error rate dan rasio 304 (conditional GET) per route; exit code 1
+bila ada threshold yang dilanggar.
+"""
+import itertools
 import json
+import random
+from collections import Counter
+
+from locust import HttpUser, between, events, task
+
+API = "/api/v1"
+POOL = {}
+_cycles = {}
+# Jumlah response 304 per nama route
+NOT_MODIFIED = Counter()
+
+
+# =====================
+# OPSI & POOL USER
+# =====================
+
+@events.init_command_line_parser.add_listener
+def add_options(parser):
+    parser.add_argument("--user-pool", default="load_test/user_pool.json",
+                        help="Pool user hasil `manage.py seed_load_test`.")
+    parser.add_argument("--thresholds", default="load_test/thresholds.json", help="Threshold per route (JSON).")
+    parser.add_argument("--report", default="load_test/report.json", help="File report JSON.")
+
+
+@events.test_start.add_listener
+def load_pool(environment, **kwargs):
+    with open(environment.parsed_options.user_pool) as f:
+        POOL.update(json.load(f))
+    _cycles.clear()
+    NOT_MODIFIED.clear()
+
+
+def next_username(role):
+    # Tiap worker mulai dari offset acak supaya login tersebar di seluruh pool
+    if role not in _cycles:
+        names = POOL[role]
+        start = random.randrange(len(names))
+        _cycles[role] = itertools.cycle(names[start:] + names[:start])
+    return next(_cycles[role])
+
+
+# =====================
+# PERSONA
+# =====================
+
+class ApiUser(HttpUser):
+    abstract = True
+    role = None
+    wait_time = between(1, 3)
 
-class UserBehavior(TaskSet):
     def on_start(self):
-        self.login()
+        self.headers = {}
+        # URL -> (ETag, body) untuk dikirim ulang sebagai If-None-Match, seperti klien yang polling
+        self.validators = {}
+        if self.role:
+            self.username = next_username(self.role)
+            self.login()
 
     def login(self):
-        response = self.client.post("/auth/sign-in", json={
-            "username": "LarissaWylie", 
-            "password": "RLS71GOH8GF" 
-        })
-        if response.status_code == 200:
-            self.token = response.json().get("access") 
+        with self.client.post(f"{API}/auth/login", name=f"POST {API}/auth/login", catch_response=True,
+                              json={"username": self.username, "password": POOL["password"]}) as r:
+            if r.status_code != 200:
+                r.failure(f"Login {self.username} gagal: {r.status_code}")
+                return
+            data = r.json()
+        self.refresh = data["refresh"]
+        self.headers = {"Authorization": f"Bearer {data['token']}"}
+        # Request berikutnya cukup bearer token: tanpa session
+        self.client.cookies.clear()
+
+    def renew_token(self):
+        r = self.client.post(f"{API}/auth/refresh", name=f"POST {API}/auth/refresh", json={"refresh": self.refresh})
+        if r.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {r.json()['token']}"}
         else:
-            print("Login failed:", response.text)
+            self.login()
+
+    def api(self, method, path, name, expected=(200,), **kwargs):
+        """Request ke apiv1; `name` adalah template route untuk pengelompokan statistik."""
+        route = f"{method} {API}{name}"
+        cache_key = f"{path}?{sorted(kwargs.get('params', {}).items())}"
+        for attempt in range(2):
+            headers = dict(self.headers)
+            known = self.validators.get(cache_key) if method == "GET" else None
+            if known:
+                headers["If-None-Match"] = known[0]
+            with self.client.request(method, f"{API}{path}", name=route, headers=headers,
+                                     catch_response=True, **kwargs) as r:
+                if r.status_code == 401 and self.role and attempt == 0:
+                    r.success()  # token kedaluwarsa: diperbarui lalu diulang
+                    self.renew_token()
+                    continue
+                if r.status_code == 304 and known:
+                    r.success()
+                    NOT_MODIFIED[route] += 1
+                    return known[1]
+                if r.status_code in expected:
+                    r.success()
+                    data = r.json() if r.content else None
+                    if method == "GET" and r.headers.get("ETag"):
+                        self.validators[cache_key] = (r.headers["ETag"], data)
+                    return data
+                r.failure(f"status {r.status_code}: {r.text[:200]}")
+                return None
+
+    def pick_course(self):
+        page = self.api("GET", "/courses", "/courses", params={"limit": 20})
+        items = (page or {}).get("items") or []
+        return random.choice(items)["id"] if items else POOL["course_id"]
+
+    def pick_content(self, course_id):
+        page = self.api("GET", f"/courses/{course_id}/contents", "/courses/{course_id}/contents")
+        items = (page or {}).get("items") or []
+        return random.choice(items)["id"] if items else None
+
+
+class BrowsingStudent(ApiUser):
+    """Student yang menjelajah katalog dan membaca konten tanpa menulis apa pun."""
+    weight = 6
+    role = "students"
+
+    @task(4)
+    def browse_catalog(self):
+        page = self.api("GET", "/courses", "/courses", params={"excerpt": "true"})
+        cursor = (page or {}).get("next_cursor")
+        if cursor:
+            self.api("GET", "/courses", "/courses", params={"cursor": cursor})
+
+    @task(3)
+    def read_course(self):
+        course_id = self.pick_course()
+        self.api("GET", f"/courses/{course_id}", "/courses/{course_id}")
+        self.api("GET", f"/courses/{course_id}/announcements/", "/courses/{course_id}/announcements/")
+        self.api("GET", f"/courses/{course_id}/feedbacks/", "/courses/{course_id}/feedbacks/")
+
+    @task(3)
+    def read_contents(self):
+        course_id = POOL["course_id"]
+        content_id = self.pick_content(course_id)
+        if content_id:
+            self.api("GET", f"/courses/{course_id}/contents/{content_id}/comments",
+                     "/courses/{course_id}/contents/{content_id}/comments")
+
+
+class ActiveStudent(ApiUser):
+    """Member course yang menyelesaikan konten, mem-bookmark dan memberi feedback."""
+    weight = 3
+    role = "students"
+
+    @task(4)
+    def complete_content(self):
+        course_id = POOL["course_id"]
+        content_id = random.choice(POOL["contents"])
+        # 409 = sudah pernah ditandai, wajar untuk user yang sama
+        self.api("POST", f"/contents/{content_id}/complete", "/contents/{content_id}/complete", expected=(200, 409))
+        self.api("GET", f"/courses/{course_id}/progress", "/courses/{course_id}/progress")
+
+    @task(2)
+    def dashboard(self):
+        progress = self.api("GET", f"/courses/{POOL['course_id']}/progress", "/courses/{course_id}/progress")
+        if progress:
+            user_id = progress["user_id"]
+            self.api("GET", f"/users/{user_id}/dashboard", "/users/{user_id}/dashboard")
+            self.api("GET", f"/users/{user_id}/completed_courses_list", "/users/{user_id}/completed_courses_list")
+
+    @task(2)
+    def bookmarks(self):
+        self.api("POST", "/bookmarks/", "/bookmarks/", json={"content_id": random.choice(POOL["contents"])})
+        self.api("GET", "/bookmarks/", "/bookmarks/")
 
     @task(1)
-    def get_my_courses(self):
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = self.client.get("/mycourses", headers=headers)
-        if response.status_code == 200:
-            self.courses = response.json() 
-            # print("My Courses:", self.courses)
-            if self.courses:
-                self.course_id = self.courses[0]['course_id']['id']
-                self.get_course_contents(self.course_id)
-
-    def get_course_contents(self, course_id):
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = self.client.get(f"/courses/{course_id}/contents", headers=headers)
-        if response.status_code == 200:
-            self.contents = response.json() 
-            # print("Course Contents:", self.contents)
-            if self.contents:
-                self.content_id = self.contents[0]['id'] 
-                self.post_comment(self.content_id)
-
-    def post_comment(self, content_id):
-        headers = {"Authorization": f"Bearer {self.token}"}
-        comment_data = {"comment": "This is a test comment."}
-        response = self.client.post(f"/contents/{content_id}/comments", json=comment_data, headers=headers)
-        if response.status_code == 201:
-            self.comment_id = response.json().get("id")
-            # print("Comment posted:", response.json())
-            self.delete_comment(self.comment_id)
-
-    def delete_comment(self, comment_id):
-        headers = {"Authorization": f"Bearer {self.token}"}
-        response = self.client.delete(f"/comments/{comment_id}", headers=headers)
-        if response.status_code == 200:
-            print("Comment deleted:", response.json())
-        else:
-            print("Failed to delete comment:", response.text)
+    def feedback(self):
+        self.api("POST", "/feedbacks/", "/feedbacks/",
+                 json={"course_id": POOL["course_id"], "rating": random.randint(1, 5), "comment": "Load test"})
+
+
+class TeacherAnalytics(ApiUser):
+    """Pengajar yang memantau analytics dan completion course-nya."""
+    weight = 1
+    role = "teachers"
+
+    @task(4)
+    def analytics(self):
+        course_id = random.choice(POOL["courses"])
+        self.api("GET", f"/courses/{course_id}/analytics", "/courses/{course_id}/analytics")
+
+    @task(2)
+    def completions(self):
+        self.api("GET", f"/courses/{POOL['course_id']}/completions/", "/courses/{course_id}/completions/")
+
+    @task(1)
+    def contents(self):
+        self.pick_content(POOL["course_id"])
+
+
+class Moderator(ApiUser):
+    """Staff yang membaca dan memoderasi komentar."""
+    weight = 1
+    role = "moderators"
+
+    @task(3)
+    def read_comments(self):
+        course_id = POOL["course_id"]
+        content_id = random.choice(POOL["contents"])
+        self.api("GET", f"/courses/{course_id}/contents/{content_id}/comments",
+                 "/courses/{course_id}/contents/{content_id}/comments")
+
+    @task(1)
+    def moderate(self):
+        if POOL["comments"]:
+            comment_id = random.choice(POOL["comments"])
+            self.api("PUT", f"/comments/{comment_id}/moderate", "/comments/{comment_id}/moderate",
+                     json={"is_moderated": True})
+
+    @task(1)
+    def clear_queue(self):
+        # Satu halaman antrian disetujui dalam satu request batch
+        course_id = POOL["course_id"]
+        page = self.api("GET", f"/courses/{course_id}/moderation-queue", "/courses/{course_id}/moderation-queue",
+                        params={"limit": 50})
+        ids = [c["id"] for c in (page or {}).get("items") or []]
+        if ids:
+            self.api("POST", "/comments/moderate", "/comments/moderate", json={"comment_ids": ids, "is_moderated": True})
+
+
+# =====================
+# REPORT & THRESHOLD
+# =====================
+
+def route_report(entry, not_modified):
+    return {
+        "route": entry.name,
+        "requests": entry.num_requests,
+        "failures": entry.num_failures,
+        "error_rate": round(entry.fail_ratio, 4),
+        "not_modified": not_modified,
+        "not_modified_rate": round(not_modified / entry.num_requests, 4) if entry.num_requests else 0,
+        "p50_ms": entry.get_response_time_percentile(0.50),
+        "p95_ms": entry.get_response_time_percentile(0.95),
+        "p99_ms": entry.get_response_time_percentile(0.99),
+    }
+
+
+def check_thresholds(row, thresholds):
+    limits = {**thresholds.get("default", {}), **thresholds.get("routes", {}).get(row["route"], {})}
+    return [
+        f"{row['route']}: {metric} {row[metric]} > {limit}"
+        for metric, limit in limits.items()
+        if row.get(metric) is not None and row[metric] > limit
+    ]
 
-class WebsiteUser(HttpUser):
-    tasks = [UserBehavior]
-    wait_time = between(1, 2) 
 
+@events.quitting.add_listener
+def write_report(environment, **kwargs):
+    options = environment.parsed_options
+    if options is None or not environment.stats.entries:
+        return
+    with open(options.thresholds) as f:
+        thresholds = json.load(f)
+    rows = [route_report(e, NOT_MODIFIED[e.name])
+            for e in sorted(environment.stats.entries.values(), key=lambda e: e.name)]
+    violations = [v for row in rows for v in check_thresholds(row, thresholds)]
+    with open(options.report, "w") as f:
+        json.dump({"routes": rows, "total": route_report(environment.stats.total, sum(NOT_MODIFIED.values())), "violations": violations},
+                  f, indent=2)
+    for violation in violations:
+        print(f"THRESHOLD: {violation}")
+    if violations:
+        environment.process_exit_code = 1